@@ -11,64 +11,226 @@ https://github.com/Limych/ha-backup_source
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Any
+import math
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Any, ClassVar
 
-from homeassistant.components.group import expand_entity_ids
+import voluptuous as vol
+from homeassistant.components.recorder import DOMAIN as RECORDER_DOMAIN
 from homeassistant.components.recorder.models import LazyState  # noqa: F401
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
-    ATTR_ASSUMED_STATE,
-    ATTR_ATTRIBUTION,
     ATTR_DEVICE_CLASS,
-    ATTR_ENTITY_PICTURE,
-    ATTR_ICON,
-    ATTR_SUPPORTED_FEATURES,
+    ATTR_ENTITY_ID,
+    ATTR_RESTORED,
     ATTR_UNIT_OF_MEASUREMENT,
+    CONF_ENTITIES,
+    CONF_ENTITY_ID,
+    CONF_EXCLUDE,
+    CONF_INCLUDE,
     CONF_NAME,
+    CONF_OFFSET,
+    CONF_PLATFORM,
     CONF_UNIQUE_ID,
-    EVENT_HOMEASSISTANT_START,
+    CONF_UNIT_OF_MEASUREMENT,
+    EVENT_STATE_CHANGED,
+    EVENT_STATE_REPORTED,
+    SERVICE_RELOAD,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
 )
 from homeassistant.core import (
     Event,
+    EventStateChangedData,
     HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
     State,
+    SupportsResponse,
     callback,
 )
-from homeassistant.helpers.entity import Entity
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import discovery
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.group import ENTITY_PREFIX as GROUP_PREFIX
+from homeassistant.helpers.group import get_entity_ids
+from homeassistant.helpers.reload import (
+    async_integration_yaml_config,
+    async_reload_integration_platforms,
+)
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.helpers.start import async_at_start
+from homeassistant.util import dt as dt_util
 
 if TYPE_CHECKING:  # pragma: no cover
-    from collections.abc import Mapping
+    from collections.abc import Callable, Mapping
 
     from homeassistant.helpers.typing import ConfigType, StateType
 
+from .bulk import async_expand_rules
 from .const import (
     ATTR_SOURCE,
+    BULK_SCHEMA,
+    CHANGE_DETECTION_EXPOSED,
+    CHANGE_DETECTION_FULL,
+    CHANGE_DETECTION_VALUE,
+    CONF_ADAPTIVE,
+    CONF_ATTRIBUTES,
+    CONF_CHANGE_DETECTION,
+    CONF_DEBOUNCE,
+    CONF_FAILBACK_DELAY,
+    CONF_HEALTH_HALF_LIFE,
+    CONF_MAX_AGE,
+    CONF_MIN_HOLD_TIME,
+    CONF_PRIORITY,
+    CONF_QUORUM,
+    CONF_SCALE,
     CONF_SKIP_NO_VALUE,
     CONF_SOURCES,
+    CONF_STRATEGY,
+    CONF_TOLERANCE,
+    CONF_VALID_IF,
+    DATA_ENTITIES,
+    DEFAULT_HEALTH_HALF_LIFE,
+    DEFAULT_QUORUM,
     DOMAIN,
+    NUMERIC_STRATEGIES,
+    PLATFORMS,
+    SERVICE_GET_METRICS,
     STARTUP_MESSAGE,
+    STRATEGY_FIRST,
+    STRATEGY_FRESHEST,
+    STRATEGY_MEAN,
+    STRATEGY_MEDIAN,
 )
+from .dispatcher import async_get_dispatcher
+from .engine import FailoverEngine, lowest_bit
+from .health import SCORE_MARGIN, HealthStore, SourceHealth, async_get_health_store
+from .history import SourceHistory, async_get_source_history
+from .metrics import FailoverMetrics
+from .projection import EntityProjection
+from .source import SourceRecord, has_value
+from .strategy import SourceValues, as_float
+from .timer import TimerEntry, async_get_timer_queue
+from .units import decimals, resolve_converter, scaled_precision
+from .validity import Validity
 
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
+CONFIG_SCHEMA = vol.Schema({vol.Optional(DOMAIN): BULK_SCHEMA}, extra=vol.ALLOW_EXTRA)
+
+GET_METRICS_SCHEMA = vol.Schema({vol.Optional(ATTR_ENTITY_ID): cv.entity_ids})
+
+type BackupSourceConfigEntry = ConfigEntry[BackupSourceEntity]
 
-async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up this integration using YAML."""
     if hass.data.get(DOMAIN) is None:
         hass.data.setdefault(DOMAIN, {})
         _LOGGER.info(STARTUP_MESSAGE)
 
+    if DOMAIN in config:
+        hass.async_create_task(async_load_bulk_entities(hass, config))
+
+    async def async_reload(call: ServiceCall) -> None:
+        """Reload all backup entities defined in YAML."""
+        if (new_config := await async_integration_yaml_config(hass, DOMAIN)) is None:
+            return
+
+        await async_reload_integration_platforms(hass, DOMAIN, PLATFORMS)
+        if DOMAIN in new_config:
+            await async_load_bulk_entities(hass, new_config)
+        hass.bus.async_fire(f"event_{DOMAIN}_reloaded", context=call.context)
+
+    async_register_admin_service(hass, DOMAIN, SERVICE_RELOAD, async_reload)
+
+    @callback
+    def async_get_metrics(call: ServiceCall) -> ServiceResponse:
+        """Return failover metrics of backup entities."""
+        entities: dict[str, BackupSourceEntity] = hass.data[DOMAIN].get(
+            DATA_ENTITIES, {}
+        )
+        entity_ids = call.data.get(ATTR_ENTITY_ID) or list(entities)
+        return {
+            entity_id: entities[entity_id].metrics.as_dict()
+            for entity_id in entity_ids
+            if entity_id in entities
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_METRICS,
+        async_get_metrics,
+        schema=GET_METRICS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    return True
+
+
+async def async_load_bulk_entities(hass: HomeAssistant, config: ConfigType) -> None:
+    """Expand bulk rules and load backup entities of all platforms at once."""
+    for platform, configs in async_expand_rules(hass, config[DOMAIN]).items():
+        if configs:
+            await discovery.async_load_platform(
+                hass, platform, DOMAIN, {CONF_ENTITIES: configs}, config
+            )
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: BackupSourceConfigEntry
+) -> bool:
+    """Set up this integration using UI."""
+    await hass.config_entries.async_forward_entry_setups(
+        entry, [entry.data[CONF_PLATFORM]]
+    )
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
     return True
 
 
-class BackupSourceEntity(Entity):
+async def async_update_options(
+    hass: HomeAssistant,  # noqa: ARG001
+    entry: BackupSourceConfigEntry,
+) -> None:
+    """Apply changed options to the live entity without reloading it."""
+    entry.runtime_data.async_reconfigure(entry.options)
+
+
+async def async_unload_entry(
+    hass: HomeAssistant, entry: BackupSourceConfigEntry
+) -> bool:
+    """Handle removal of an entry."""
+    return await hass.config_entries.async_unload_platforms(
+        entry, [entry.data[CONF_PLATFORM]]
+    )
+
+
+def entry_config(entry: ConfigEntry, schema: vol.Schema) -> ConfigType:
+    """Return entity config of config entry validated by platform schema."""
+    return schema(
+        {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: entry.title,
+            CONF_UNIQUE_ID: entry.entry_id,
+            **entry.options,
+        }
+    )
+
+
+class BackupSourceEntity(RestoreEntity):
     """Backup Source Entity class."""
 
     _attr_has_entity_name = True
     _attr_should_poll = False
 
+    # Attributes of the exposed state read by entity properties
+    _projection_class: ClassVar[type[EntityProjection]] = EntityProjection
+
     def __init__(self, hass: HomeAssistant, config: ConfigType) -> None:
         """Initialize the sensor."""
         self.hass = hass
@@ -76,64 +238,911 @@ class BackupSourceEntity(Entity):
         self._attr_unique_id = config.get(CONF_UNIQUE_ID)
         self._attr_name = config.get(CONF_NAME)
 
-        self.sources = expand_entity_ids(hass, config.get(CONF_SOURCES))
+        self._init_sources(config)
+        self._started = False
+        self.change_detection = config.get(
+            CONF_CHANGE_DETECTION, CHANGE_DETECTION_EXPOSED
+        )
+        self._init_attributes(config)
+        self._init_debounce(config)
+        self._init_hysteresis(config)
+        self._init_strategy(config)
+        self._init_units(config)
+
+        self._engine = FailoverEngine()
+        self._source_index: dict[str, int] = {}
+        self._source_states: list[State | None] = []
+        self._fingerprint: tuple | None = None
+        self._event_type = EVENT_STATE_REPORTED if self._aging else EVENT_STATE_CHANGED
+        self._subscribed: tuple[list[str], list[str]] = ([], [])
+        self.metrics = FailoverMetrics()
+
+        self._init_health(config)
+
+        # Last good states of sources recorded before Home Assistant start
+        self._backfill: dict[str, State] = {}
+
+        first_source = (self.sources or self._config_sources)[0]
+        self._state = hass.states.get(first_source) or State(
+            first_source, STATE_UNAVAILABLE
+        )
+        self._fields = self._projection_class(self._state)
+
+    def _init_sources(self, config: ConfigType) -> None:
+        """Initialize sources and options applied to all of them."""
+        # Rules of validity of source values are compiled once on setup
+        valid_if = config.get(CONF_VALID_IF)
+        self._valid_if = Validity(self.hass, valid_if) if valid_if else None
         self.skip_no_value = config.get(CONF_SKIP_NO_VALUE)
 
-        self._state = hass.states.get(self.sources[0]) or State(
-            self.sources[0], STATE_UNAVAILABLE
+        # Sources which have not reported for max_age are considered dead
+        max_age = config.get(CONF_MAX_AGE)
+        self._max_age = max_age.total_seconds() if max_age else 0.0
+        self._expiry: list[TimerEntry | None] = []
+
+        self._config_sources: list[str] = []
+        self._config_records: list[SourceRecord] = []
+        self._set_config_sources(config.get(CONF_SOURCES))
+        self.sources, self._records, self._groups = self._expand_sources()
+        # Reports of sources are tracked if any of them has max_age
+        self._aging = any(record.max_age for record in self._config_records)
+
+    def _init_attributes(self, config: ConfigType) -> None:
+        """Initialize filtering of attributes of the selected source."""
+        attributes = config.get(CONF_ATTRIBUTES) or {}
+        self._attributes_include: frozenset[str] | None = (
+            frozenset(attributes[CONF_INCLUDE]) if CONF_INCLUDE in attributes else None
+        )
+        self._attributes_exclude = frozenset(attributes.get(CONF_EXCLUDE, ()))
+        self._attributes_state: State | None = None
+        self._attributes: dict[str, Any] = {}
+
+    def _init_debounce(self, config: ConfigType) -> None:
+        """Initialize coalescing of bursts of source updates into one write."""
+        debounce = config.get(CONF_DEBOUNCE)
+        self._debouncer: Debouncer | None = (
+            Debouncer(
+                self.hass,
+                _LOGGER,
+                cooldown=debounce.total_seconds(),
+                immediate=True,
+                function=self._async_publish,
+            )
+            if debounce
+            else None
+        )
+
+    def _init_hysteresis(self, config: ConfigType) -> None:
+        """Initialize hysteresis of switching back to higher priority sources."""
+        min_hold_time = config.get(CONF_MIN_HOLD_TIME)
+        failback_delay = config.get(CONF_FAILBACK_DELAY)
+        self._min_hold_time = min_hold_time.total_seconds() if min_hold_time else 0.0
+        self._failback_delay = failback_delay.total_seconds() if failback_delay else 0.0
+        self._hysteresis = bool(self._min_hold_time or self._failback_delay)
+        self._selected = -1
+        self._selected_since = 0.0
+        self._eligible_since: list[float] = []
+        self._recheck: TimerEntry | None = None
+
+    def _init_strategy(self, config: ConfigType) -> None:
+        """Initialize strategy of picking the result among sources with a value."""
+        self.strategy = config.get(CONF_STRATEGY, STRATEGY_FIRST)
+        self._tolerance: float | None = config.get(CONF_TOLERANCE)
+        self._quorum: int = config.get(CONF_QUORUM, DEFAULT_QUORUM)
+        self._values = SourceValues() if self.strategy in NUMERIC_STRATEGIES else None
+        # Decimal places of values of sources, aggregates are formatted with
+        self._precisions: list[int | None] = []
+        self._freshest = -1
+        self._aggregate: tuple[State | None, str | None, State | None] = (
+            None,
+            None,
+            None,
         )
 
+    def _init_units(self, config: ConfigType) -> None:
+        """Initialize conversion of values of all sources to the same unit."""
+        self._unit: str | None = config.get(CONF_UNIT_OF_MEASUREMENT)
+        self._converters: dict[
+            str, tuple[str | None, Callable[[float], float] | None]
+        ] = {}
+        self._normalized: dict[str, tuple[State, SourceRecord, State]] = {}
+
+    def _init_health(self, config: ConfigType) -> None:
+        """Initialize adaptive choice of the healthiest source of a tier."""
+        self._adaptive: bool = config.get(CONF_ADAPTIVE, False)
+        self._half_life = config.get(
+            CONF_HEALTH_HALF_LIFE, DEFAULT_HEALTH_HALF_LIFE
+        ).total_seconds()
+        self._health_store: HealthStore | None = None
+        self._health: list[SourceHealth] = []
+
     async def async_added_to_hass(self) -> None:
         """Register callbacks."""
+        if self._debouncer is not None:
+            self.async_on_remove(self._debouncer.async_shutdown)
+        self.async_on_remove(self._async_cancel_timers)
+
+        entities = self.hass.data.setdefault(DOMAIN, {}).setdefault(DATA_ENTITIES, {})
+        entities[self.entity_id] = self
 
-        # pylint: disable=unused-argument
         @callback
-        async def async_sensor_state_listener(event: Event) -> None:  # noqa: ARG001
-            """Handle device state changes."""
-            last_state = self._state
+        def async_unregister() -> None:
+            """Forget entity when it is removed."""
+            if entities.get(self.entity_id) is self:
+                del entities[self.entity_id]
+
+        self.async_on_remove(async_unregister)
+
+        if self._adaptive:
+            self._health_store = await async_get_health_store(self.hass)
+
+        # Groups may have been set up after the entity was created
+        self.sources, self._records, self._groups = self._expand_sources()
+
+        # Show last known output until sources are reconciled on start
+        if not self._has_state(self._state):
+            await self._async_restore_state()
+
+        # Sources of all entities added on boot are backfilled with one job
+        backfill = (
+            not self.hass.is_running and RECORDER_DOMAIN in self.hass.config.components
+        )
+        if backfill:
+            source_history = async_get_source_history(self.hass)
+            source_history.async_register(self.sources)
+            task = self.hass.async_create_task(self._async_backfill(source_history))
+            self.async_on_remove(task.cancel)
+
+        async def async_sensor_startup(hass: HomeAssistant) -> None:
+            """Start tracking sources once Home Assistant is starting."""
+            # Groups may have been set up after the entity was created
+            self.sources, self._records, self._groups = self._expand_sources()
+            self._async_resubscribe(self.sources, self._groups)
+            self.async_on_remove(self._async_unsubscribe)
+            if backfill:
+                self._backfill = await async_get_source_history(hass).async_get_states(
+                    self.sources
+                )
+            self._started = True
             await self.async_update()
-            if last_state != self._state:
-                self.async_schedule_update_ha_state(force_refresh=True)
+            self._backfill = {}
+            self._fingerprint = self._async_fingerprint()
+            self.async_write_ha_state()
 
-        # pylint: disable=unused-argument
-        @callback
-        async def async_sensor_startup(event: Event) -> None:  # noqa: ARG001
-            """Update template on startup."""
-            async_track_state_change_event(
-                self.hass, self.sources, async_sensor_state_listener
+        # Entities added later (e.g. on reload) are started immediately
+        self.async_on_remove(async_at_start(self.hass, async_sensor_startup))
+
+    async def _async_backfill(self, source_history: SourceHistory) -> None:
+        """Show recorded states of sources until Home Assistant has started."""
+        backfill = await source_history.async_get_states(self.sources)
+        if self._started or not backfill:
+            return
+
+        self._backfill = backfill
+        await self.async_update()
+        self._backfill = {}
+        self.async_write_ha_state()
+
+    def _set_config_sources(self, entries: list[Any]) -> None:
+        """
+        Set configured sources and records of their options.
+
+        Sources listed in a nested list share a tier, and so do sources with
+        equal priority option wherever they are listed; the tier takes place
+        of its first source. Sources with higher priority go first. Options
+        of a source override ones of the entity.
+        """
+        configured: list[tuple[int, int, Mapping[str, Any]]] = []
+        first_positions: dict[int, int] = {}
+        for position, entry in enumerate(entries):
+            for source in entry if isinstance(entry, list) else [entry]:
+                options = (
+                    source if isinstance(source, dict) else {CONF_ENTITY_ID: source}
+                )
+                priority = options.get(CONF_PRIORITY, 0)
+                tier_position = (
+                    first_positions.setdefault(priority, position)
+                    if CONF_PRIORITY in options
+                    else position
+                )
+                configured.append((-priority, tier_position, options))
+        configured.sort(key=lambda item: item[:2])
+
+        self._config_sources = []
+        self._config_records = []
+        tiers: dict[tuple[int, int], int] = {}
+        for priority, position, options in configured:
+            max_age = options.get(CONF_MAX_AGE)
+            valid_if = options.get(CONF_VALID_IF)
+            self._config_sources.append(options[CONF_ENTITY_ID])
+            self._config_records.append(
+                SourceRecord(
+                    tier=tiers.setdefault((priority, position), len(tiers)),
+                    priority=-priority,
+                    max_age=max_age.total_seconds() if max_age else self._max_age,
+                    scale=options.get(CONF_SCALE),
+                    offset=options.get(CONF_OFFSET),
+                    skip_no_value=bool(
+                        options.get(CONF_SKIP_NO_VALUE, self.skip_no_value)
+                    ),
+                    validity=(
+                        Validity(self.hass, valid_if) if valid_if else self._valid_if
+                    ),
+                )
             )
-            await self.async_update()
-            self.async_schedule_update_ha_state()
 
-        self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, async_sensor_startup)
+    @callback
+    def async_reconfigure(self, config: Mapping[str, Any]) -> None:
+        """
+        Apply new list of sources and skip_no_value option in place.
+
+        Subscriptions and priority index are patched, so only added sources
+        are looked up and other entities are not touched at all.
+        """
+        self.skip_no_value = config[CONF_SKIP_NO_VALUE]
+        self._set_config_sources(config[CONF_SOURCES])
+        if not self._started:
+            self.sources, self._records, self._groups = self._expand_sources()
+            return
+
+        _LOGGER.debug('Sources of "%s" have been reconfigured', self.entity_id)
+        last_state = self._state
+        sources, self._records, self._groups = self._expand_sources()
+        self._async_patch_sources(sources)
+        self._async_resubscribe(self.sources, self._groups)
+        if last_state is not self._state:
+            self._async_schedule_publish()
+
+    async def _async_restore_state(self) -> None:
+        """Restore last selected source and its value."""
+        if (last_state := await self.async_get_last_state()) is None:
+            return
+
+        source = last_state.attributes.get(ATTR_SOURCE)
+        if source not in self.sources:
+            source = (self.sources or self._config_sources)[0]
+        _LOGGER.debug('Restored state of "%s" from "%s"', self.entity_id, source)
+        self._expose(
+            State(
+                source,
+                last_state.state,
+                last_state.attributes,
+                validate_entity_id=False,
+            )
+        )
+
+    @callback
+    def _async_handle_source_event(self, event: Event[EventStateChangedData]) -> None:
+        """Handle device state changes."""
+        start = time.perf_counter()
+        last_state = self._state
+        self._async_source_changed(event.data["entity_id"], event.data["new_state"])
+        changed = last_state is not self._state
+        # Latency of selection only, writing of the state is not timed
+        self.metrics.record_event(time.perf_counter() - start, changed=changed)
+        if changed:
+            self._async_schedule_publish()
+
+    @callback
+    def _async_handle_group_event(self, event: Event[EventStateChangedData]) -> None:
+        """Handle changes of group membership."""
+        old_state = event.data["old_state"]
+        new_state = event.data["new_state"]
+        old_members = old_state.attributes.get(ATTR_ENTITY_ID) if old_state else None
+        new_members = new_state.attributes.get(ATTR_ENTITY_ID) if new_state else None
+        if old_members == new_members:
+            return
+
+        _LOGGER.debug('Members of group "%s" have changed', event.data["entity_id"])
+        last_state = self._state
+        sources, self._records, self._groups = self._expand_sources()
+        self._async_patch_sources(sources)
+        self._async_resubscribe(self.sources, self._groups)
+        if last_state is not self._state:
+            self._async_schedule_publish()
+
+    @callback
+    def _async_schedule_publish(self) -> None:
+        """Publish entity state now or after debounce."""
+        if self._debouncer is None:
+            self._async_publish()
+        else:
+            self._debouncer.async_schedule_call()
+
+    @callback
+    def _async_fingerprint(self) -> tuple | None:
+        """
+        Return fingerprint of the entity output used to detect changes.
+
+        None means that every update of the selected source is published.
+        Projected fields are included, as attribute filters may hide them
+        from extra state attributes while entity properties still expose them.
+        """
+        if self.change_detection == CHANGE_DETECTION_FULL:
+            return None
+        if self.change_detection == CHANGE_DETECTION_VALUE:
+            return (self.available, self.state, self._state.entity_id)
+        return (
+            self.available,
+            self.state,
+            self.extra_state_attributes,
+            self._fields.values(),
+        )
+
+    @callback
+    def _async_publish(self) -> None:
+        """Write entity state if its visible output has changed."""
+        fingerprint = self._async_fingerprint()
+        if fingerprint is not None and fingerprint == self._fingerprint:
+            return
+
+        # Selection is already done, so publish result without a refresh
+        self._fingerprint = fingerprint
+        self.async_write_ha_state()
 
     @staticmethod
     def _has_state(state: State) -> bool:
         """Return True if state has any value."""
-        return state.state is not None and state.state not in [
-            STATE_UNKNOWN,
-            STATE_UNAVAILABLE,
-            "None",
-            "",
+        return has_value(state)
+
+    def _expand_sources(self) -> tuple[list[str], list[SourceRecord], list[str]]:
+        """
+        Return configured sources with groups replaced by their members.
+
+        Members of a group share the record of options of the group.
+        """
+        sources: dict[str, SourceRecord] = {}
+        groups: dict[str, None] = {}
+
+        def expand(entity_ids: list[str], records: list[SourceRecord]) -> None:
+            for entity_id, record in zip(entity_ids, records, strict=True):
+                if not entity_id.startswith(GROUP_PREFIX):
+                    sources.setdefault(entity_id, record)
+                elif entity_id not in groups:
+                    groups[entity_id] = None
+                    members = get_entity_ids(self.hass, entity_id)
+                    expand(members, [record] * len(members))
+
+        expand(self._config_sources, self._config_records)
+        return list(sources), list(sources.values()), list(groups)
+
+    @callback
+    def _async_resubscribe(self, sources: list[str], groups: list[str]) -> None:
+        """Update subscriptions to match sources and groups."""
+        old_sources, old_groups = self._subscribed
+        for entity_ids, old_entity_ids, dispatcher, listener in (
+            (
+                sources,
+                old_sources,
+                async_get_dispatcher(self.hass, self._event_type),
+                self._async_handle_source_event,
+            ),
+            (
+                groups,
+                old_groups,
+                async_get_dispatcher(self.hass),
+                self._async_handle_group_event,
+            ),
+        ):
+            new_set = set(entity_ids)
+            old_set = set(old_entity_ids)
+            if removed := old_set - new_set:
+                dispatcher.async_unsubscribe(removed, listener)
+            if added := new_set - old_set:
+                dispatcher.async_subscribe(added, listener)
+        self._subscribed = (list(sources), list(groups))
+
+    @callback
+    def _async_unsubscribe(self) -> None:
+        """Unsubscribe from all sources and groups."""
+        self._async_resubscribe([], [])
+
+    @callback
+    def _async_patch_sources(self, sources: list[str]) -> None:
+        """
+        Replace list of sources in place.
+
+        States and timers of retained sources are reused, so only added
+        sources are looked up in the state machine.
+        """
+        old_index = self._source_index
+        old_states = self._source_states
+        old_since = self._eligible_since
+        old_expiry = self._expiry
+        selected = self.sources[self._selected] if self._selected >= 0 else None
+
+        states: list[State | None] = []
+        since: list[float] = []
+        expiry: list[TimerEntry | None] = []
+        added: list[int] = []
+        for entity_id in sources:
+            if (index := old_index.get(entity_id)) is not None:
+                states.append(old_states[index])
+                since.append(old_since[index])
+                expiry.append(old_expiry[index] if old_expiry else None)
+            else:
+                added.append(len(states))
+                states.append(self.hass.states.get(entity_id))
+                since.append(0.0)
+                expiry.append(None)
+
+        if old_expiry:
+            timers = async_get_timer_queue(self.hass)
+            for entity_id, index in old_index.items():
+                if entity_id not in sources:
+                    timers.async_cancel(old_expiry[index])
+
+        self.sources = sources
+        self._source_index = {
+            entity_id: index for index, entity_id in enumerate(sources)
+        }
+        self._source_states = states
+        self._eligible_since = since
+        self._expiry = expiry if self._aging else []
+        self._async_reset_selection()
+        self._selected = self._source_index.get(selected, -1)
+        if self._aging:
+            for index in added:
+                self._async_track_expiry(index, states[index])
+        self._async_select()
+
+    def _is_eligible(self, state: State | None, record: SourceRecord) -> bool:
+        """Return True if state of source can be selected."""
+        if state is None:
+            return False
+        if record.skip_no_value and not self._has_state(state):
+            return False
+        if (
+            record.validity is not None
+            and self._has_state(state)
+            and not record.validity(state)
+        ):
+            return False
+        if (
+            self._unit is not None
+            and self._has_state(state)
+            and self._converter(state) is None
+        ):
+            return False
+        return (
+            not record.max_age
+            or dt_util.utcnow().timestamp() - state.last_reported_timestamp
+            < record.max_age
+        )
+
+    @callback
+    def _async_cancel_timers(self) -> None:
+        """Cancel all scheduled timers of the entity."""
+        timers = async_get_timer_queue(self.hass)
+        timers.async_cancel(self._recheck)
+        self._recheck = None
+        for entry in self._expiry:
+            timers.async_cancel(entry)
+        self._expiry = [None] * len(self._expiry)
+
+    @callback
+    def _async_schedule_recheck(self, when: float) -> None:
+        """Schedule recheck of selection at UTC timestamp."""
+        if self._recheck is not None and self._recheck.active:
+            if self._recheck.when == when:
+                return
+            async_get_timer_queue(self.hass).async_cancel(self._recheck)
+        self._recheck = async_get_timer_queue(self.hass).async_schedule(
+            when, self._async_recheck
+        )
+
+    @callback
+    def _async_recheck(self) -> None:
+        """Recheck selection when hysteresis timeout expires."""
+        self._recheck = None
+        last_state = self._state
+        self._async_select()
+        if last_state is not self._state:
+            self._async_schedule_publish()
+
+    @callback
+    def _async_track_expiry(self, index: int, state: State | None) -> None:
+        """Schedule the moment when state of source becomes stale."""
+        timers = async_get_timer_queue(self.hass)
+        timers.async_cancel(self._expiry[index])
+        self._expiry[index] = None
+        max_age = self._records[index].max_age
+        if state is not None and max_age and self._engine.is_eligible(index):
+            self._expiry[index] = timers.async_schedule(
+                state.last_reported_timestamp + max_age,
+                partial(self._async_source_expired, state),
+            )
+
+    @callback
+    def _async_source_expired(self, state: State) -> None:
+        """
+        Handle source which has not reported for max_age.
+
+        Source is looked up by entity ID, as its index changes when the
+        list of sources is patched while the timer is pending.
+        """
+        index = self._source_index.get(state.entity_id)
+        if index is None:
+            return
+        self._expiry[index] = None
+        if self._source_states[index] is not state:
+            return
+
+        _LOGGER.debug('Entity "%s" has a stale state', state.entity_id)
+        last_state = self._state
+        self._async_update_source(index, state, eligible=False)
+        self._async_select()
+        if last_state is not self._state:
+            self._async_schedule_publish()
+
+    @callback
+    def _async_choose(self) -> int:
+        """Return index of the source to select."""
+        if self.strategy == STRATEGY_FRESHEST:
+            return self._freshest
+
+        candidate = self._engine.active
+        if self._health and candidate >= 0:
+            candidate = self._healthiest(candidate)
+        current = self._selected
+        if (
+            not self._hysteresis
+            or candidate < 0
+            or current < 0
+            or candidate >= current
+            or not self._engine.is_eligible(current)
+        ):
+            return candidate
+
+        # Higher priority source has a value again, but switching back to it
+        # is allowed only when both hold time and failback delay have passed
+        now = dt_util.utcnow().timestamp()
+        wake_at = self._selected_since + self._min_hold_time
+        if now >= wake_at:
+            wake_at = math.inf
+            mask = self._engine.mask & ((1 << current) - 1)
+            while mask:
+                index = lowest_bit(mask)
+                ready_at = self._eligible_since[index] + self._failback_delay
+                if ready_at <= now:
+                    return index
+                wake_at = min(wake_at, ready_at)
+                mask &= mask - 1
+
+        self._async_schedule_recheck(wake_at)
+        return current
+
+    @callback
+    def _async_select(self) -> None:
+        """Set entity state from the selected source."""
+        index = self._async_choose()
+        if index != self._selected:
+            self._selected = index
+            if self._hysteresis:
+                self._selected_since = dt_util.utcnow().timestamp()
+
+        if index >= 0:
+            self.metrics.record_selection(self.sources[index])
+            state = self._source_states[index]
+            record = self._records[index]
+            if self._unit is not None or record.transforms:
+                state = self._normalize(state, record)
+            if self._values is not None:
+                state = self._aggregated(state)
+        else:
+            self.metrics.record_selection(None)
+
+            # No source has a value, so fall back to the last one in the list
+            if self._source_states and self._source_states[-1] is not None:
+                state = self._source_states[-1]
+                record = self._records[-1]
+                if self._unit is not None or record.transforms:
+                    state = self._normalize(state, record)
+            else:
+                state = State(
+                    (self.sources or self._config_sources)[-1], STATE_UNAVAILABLE
+                )
+
+        self._expose(self._async_compose(state))
+
+    @callback
+    def _async_compose(self, state: State) -> State:
+        """Return state to expose composed from the selected one."""
+        return state
+
+    def _expose(self, state: State) -> None:
+        """Expose state, projecting its attributes only when it changes."""
+        if state is not self._state:
+            self._state = state
+            self._fields = self._projection_class(state)
+
+    def _converter(self, state: State) -> Callable[[float], float] | None:
+        """Return converter of values of source to the target unit."""
+        unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        cached = self._converters.get(state.entity_id)
+        if cached is not None and cached[0] == unit:
+            return cached[1]
+
+        # Converters are resolved only when unit of source changes
+        converter = resolve_converter(
+            unit, self._unit, state.attributes.get(ATTR_DEVICE_CLASS)
+        )
+        if converter is None:
+            _LOGGER.warning(
+                'Unable to convert values of "%s" from "%s" to "%s"',
+                state.entity_id,
+                unit,
+                self._unit,
+            )
+        self._converters[state.entity_id] = (unit, converter)
+        return converter
+
+    def _source_value(self, state: State | None, record: SourceRecord) -> float | None:
+        """Return numeric value of source rescaled and in the target unit."""
+        value = as_float(state)
+        if value is None:
+            return None
+        if record.transforms:
+            value = record.transform(value)
+        if self._unit is None:
+            return value
+        converter = self._converter(state)
+        return None if converter is None else converter(value)
+
+    def _precision(self, state: State, record: SourceRecord) -> int | None:
+        """
+        Return number of decimal places of rescaled value of source.
+
+        Display precision of the source sensor is preferred over decimal
+        places of its state. Precision grows when values are scaled down by
+        the transform or unit conversion, like Home Assistant does on
+        conversion of units of sensors.
+        """
+        entry = er.async_get(self.hass).async_get(state.entity_id)
+        options = entry.options.get(SENSOR_DOMAIN, {}) if entry else {}
+        precision = options.get("display_precision")
+        if precision is None:
+            precision = options.get("suggested_display_precision")
+        if precision is None and (precision := decimals(state.state)) is None:
+            return None
+
+        scale = record.scale
+        if self._unit is not None and (converter := self._converter(state)):
+            scale *= converter(1.0) - converter(0.0)
+        precision = scaled_precision(precision, scale)
+        if record.offset:
+            precision = max(precision, decimals(repr(record.offset)) or 0)
+        return precision
+
+    def _normalize(self, state: State, record: SourceRecord) -> State:
+        """Return state of source with value rescaled and in the target unit."""
+        cached = self._normalized.get(state.entity_id)
+        if cached is not None and cached[0] is state and cached[1] is record:
+            return cached[2]
+
+        if (value := self._source_value(state, record)) is not None:
+            precision = self._precision(state, record)
+            new_state = str(value) if precision is None else f"{value:.{precision}f}"
+        elif (
+            self._unit is not None
+            and self._has_state(state)
+            and self._converter(state) is None
+        ):
+            new_state = STATE_UNKNOWN
+        else:
+            new_state = state.state
+        normalized = State(
+            state.entity_id,
+            new_state,
+            state.attributes
+            if self._unit is None
+            else {**state.attributes, ATTR_UNIT_OF_MEASUREMENT: self._unit},
+            last_changed=state.last_changed,
+            last_reported=state.last_reported,
+            last_updated=state.last_updated,
+            validate_entity_id=False,
+        )
+        self._normalized[state.entity_id] = (state, record, normalized)
+        return normalized
+
+    def _healthiest(self, candidate: int) -> int:
+        """Return the healthiest source with a value in tier of candidate."""
+        records = self._records
+        tier = records[candidate].tier
+        health = self._health
+        now = dt_util.utcnow().timestamp()
+        best = candidate
+        best_score = health[candidate].score(now, self._half_life)
+        index = candidate + 1
+        while index < len(records) and records[index].tier == tier:
+            if self._engine.is_eligible(index):
+                score = health[index].score(now, self._half_life)
+                if score > best_score:
+                    best, best_score = index, score
+            index += 1
+
+        # Don't leave current source unless another one is notably healthier
+        current = self._selected
+        if (
+            current not in (-1, best)
+            and records[current].tier == tier
+            and self._engine.is_eligible(current)
+            and health[current].score(now, self._half_life)[0]
+            >= best_score[0] - SCORE_MARGIN
+        ):
+            return current
+        return best
+
+    def _find_freshest(self) -> int:
+        """Return index of the most recently updated source with a value."""
+        freshest = -1
+        freshest_ts = -math.inf
+        mask = self._engine.mask
+        while mask:
+            index = lowest_bit(mask)
+            timestamp = self._source_states[index].last_updated_timestamp
+            if timestamp >= freshest_ts:
+                freshest, freshest_ts = index, timestamp
+            mask &= mask - 1
+        return freshest
+
+    def _source_precision(
+        self, state: State | None, record: SourceRecord, *, eligible: bool
+    ) -> int | None:
+        """Return decimal places of value of source used for aggregation."""
+        if not eligible or as_float(state) is None:
+            return None
+        return self._precision(state, record)
+
+    def _aggregated(self, state: State) -> State:
+        """
+        Return state with value aggregated from values of all sources.
+
+        The value is formatted with the most decimal places of the sources,
+        so aggregates neither gain float noise nor lose digits of sources.
+        """
+        if self.strategy == STRATEGY_MEDIAN:
+            value = self._values.median()
+        elif self.strategy == STRATEGY_MEAN:
+            value = self._values.mean(self._tolerance)
+        else:
+            value = self._values.quorum(self._quorum, self._tolerance or 0.0)
+        if value is None:
+            new_state = STATE_UNKNOWN
+        elif (
+            precision := max(
+                (x for x in self._precisions if x is not None), default=None
+            )
+        ) is None:
+            new_state = str(value)
+        else:
+            new_state = f"{value:.{precision}f}"
+
+        # Reuse composed state while neither its base nor the value changes
+        base, last_value, composed = self._aggregate
+        if composed is not None and base is state and last_value == new_state:
+            return composed
+
+        composed = State(
+            state.entity_id, new_state, state.attributes, validate_entity_id=False
+        )
+        self._aggregate = (state, new_state, composed)
+        return composed
+
+    @callback
+    def _async_reset_selection(self) -> None:
+        """Rebuild selection data from cached states of all sources."""
+        states = self._source_states
+        records = self._records
+        eligible = [
+            self._is_eligible(state, record)
+            for state, record in zip(states, records, strict=True)
         ]
+        self._engine.reset(eligible)
+        # Sources are final only on start, so scores of sources which are
+        # not known yet (e.g. members of groups) are kept until then
+        if self._health_store is not None and self._started:
+            self._health = self._health_store.async_get_records(
+                self.entity_id, self.sources
+            )
+            now = dt_util.utcnow().timestamp()
+            for health, flag in zip(self._health, eligible, strict=True):
+                health.update(now, self._half_life, available=flag, count=False)
+            self._health_store.async_mark_dirty()
+        if self._values is not None:
+            self._values.reset(
+                self._source_value(state, record) if flag else None
+                for state, record, flag in zip(states, records, eligible, strict=True)
+            )
+            self._precisions = [
+                self._source_precision(state, record, eligible=flag)
+                for state, record, flag in zip(states, records, eligible, strict=True)
+            ]
+        if self.strategy == STRATEGY_FRESHEST:
+            self._freshest = self._find_freshest()
+
+    @callback
+    def _async_update_source(
+        self, index: int, state: State | None, *, eligible: bool
+    ) -> None:
+        """Update selection data from a new state of a single source."""
+        self._engine.update(index, eligible)
+        if self._health:
+            self._health[index].update(
+                dt_util.utcnow().timestamp(), self._half_life, available=eligible
+            )
+            self._health_store.async_mark_dirty()
+        if self._values is not None:
+            record = self._records[index]
+            self._values.update(
+                index, self._source_value(state, record) if eligible else None
+            )
+            self._precisions[index] = self._source_precision(
+                state, record, eligible=eligible
+            )
+        if self.strategy != STRATEGY_FRESHEST:
+            return
+
+        # Events come in order, so the source just updated is the freshest one
+        freshest = self._freshest
+        if eligible:
+            if (
+                freshest < 0
+                or state.last_updated_timestamp
+                >= self._source_states[freshest].last_updated_timestamp
+            ):
+                self._freshest = index
+        elif index == freshest:
+            self._freshest = self._find_freshest()
+
+    @callback
+    def _async_source_changed(self, entity_id: str, state: State | None) -> None:
+        """Update selection from a state change of a single source."""
+        index = self._source_index.get(entity_id)
+        if index is None:
+            return
+
+        self._source_states[index] = state
+        eligible = self._is_eligible(state, self._records[index])
+        if self._hysteresis and eligible and not self._engine.is_eligible(index):
+            self._eligible_since[index] = dt_util.utcnow().timestamp()
+        self._async_update_source(index, state, eligible=eligible)
+        if self._aging:
+            self._async_track_expiry(index, state)
+        self._async_select()
 
     async def async_update(self) -> None:
         """Update sensor state."""
-        for entity_id in self.sources:
+        self._source_index = {
+            entity_id: index for index, entity_id in enumerate(self.sources)
+        }
+        self._source_states = states = []
+        for entity_id, record in zip(self.sources, self._records, strict=True):
             _LOGGER.debug('Processing entity "%s"', entity_id)
 
             state = self.hass.states.get(entity_id)  # type: LazyState
+            if (state is None or state.attributes.get(ATTR_RESTORED)) and (
+                recorded := self._backfill.get(entity_id)
+            ) is not None:
+                _LOGGER.debug('Using recorded state of "%s"', entity_id)
+                state = recorded
             if state is None:
                 _LOGGER.debug('Unable to find an entity "%s"', entity_id)
-                continue
-            if self.skip_no_value and not self._has_state(state):
+            elif record.skip_no_value and not self._has_state(state):
                 _LOGGER.debug('Entity "%s" has state with no value', entity_id)
-                continue
+            states.append(state)
 
-            break
+        self._async_reset_selection()
+        self._eligible_since = [0.0] * len(states)
+        self._selected = -1
+        if self._aging:
+            self._async_cancel_timers()
+            self._expiry = [None] * len(states)
+            for index, state in enumerate(states):
+                self._async_track_expiry(index, state)
 
-        # Set sensor state to last selected sensor from list of sources
-        self._state = state
+        # Set sensor state to first selected sensor from list of sources
+        self._async_select()
 
     @property
     def available(self) -> bool:
@@ -145,49 +1154,66 @@ class BackupSourceEntity(Entity):
         """Return the state of the entity."""
         return self._state.state
 
+    def _build_attributes(self, state: State) -> dict[str, Any]:
+        """Build entity attributes from attributes of source state."""
+        include = self._attributes_include
+        exclude = self._attributes_exclude
+        if include is None and not exclude:
+            attributes = dict(state.attributes)
+        else:
+            attributes = {
+                key: value
+                for key, value in state.attributes.items()
+                if (include is None or key in include) and key not in exclude
+            }
+        attributes[ATTR_SOURCE] = state.entity_id
+        return attributes
+
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
         """
         Return entity specific state attributes.
 
-        Implemented by platform classes. Convention for attribute names
-        is lowercase snake_case.
+        Attributes are built once per selected source state and reused
+        until another state is selected.
         """
-        attributes = self._state.attributes.copy()
-        attributes[ATTR_SOURCE] = self._state.entity_id
-        return attributes
+        if self._attributes_state is not self._state:
+            self._attributes = self._build_attributes(self._state)
+            self._attributes_state = self._state
+        return self._attributes
 
     @property
     def unit_of_measurement(self) -> str | None:
         """Return the unit of measurement of this entity, if any."""
-        return self._state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        return self._fields.unit_of_measurement
 
     @property
     def assumed_state(self) -> bool:
         """Return True if unable to access real state of the entity."""
-        return self._state.attributes.get(ATTR_ASSUMED_STATE, False)
+        assumed_state = self._fields.assumed_state
+        return False if assumed_state is None else assumed_state
 
     @property
     def attribution(self) -> str | None:
         """Return the attribution."""
-        return self._state.attributes.get(ATTR_ATTRIBUTION)
+        return self._fields.attribution
 
     @property
     def device_class(self) -> str | None:
         """Return the class of this device, from component DEVICE_CLASSES."""
-        return self._state.attributes.get(ATTR_DEVICE_CLASS)
+        return self._fields.device_class
 
     @property
     def entity_picture(self) -> str | None:
         """Return the entity picture to use in the frontend, if any."""
-        return self._state.attributes.get(ATTR_ENTITY_PICTURE)
+        return self._fields.entity_picture
 
     @property
     def icon(self) -> str | None:
         """Return the icon to use in the frontend, if any."""
-        return self._state.attributes.get(ATTR_ICON)
+        return self._fields.icon
 
     @property
     def supported_features(self) -> int | None:
         """Flag supported features."""
-        return self._state.attributes.get(ATTR_SUPPORTED_FEATURES)
+        return self._fields.supported_features
@@ -5,35 +5,213 @@
 
 from __future__ import annotations
 
+from functools import partial
 from typing import TYPE_CHECKING
 
 from homeassistant.components.binary_sensor import PLATFORM_SCHEMA, BinarySensorEntity
-from homeassistant.const import STATE_ON
+from homeassistant.const import CONF_ENTITIES, STATE_OFF, STATE_ON
+from homeassistant.core import State, callback
+from homeassistant.util import dt as dt_util
 
 if TYPE_CHECKING:  # pragma: no cover
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
     from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
-from . import BackupSourceEntity
-from .const import COMMON_BACKUP_SCHEMA
+    from .timer import TimerEntry
 
-PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(COMMON_BACKUP_SCHEMA)
+from . import BackupSourceConfigEntry, BackupSourceEntity, entry_config
+from .const import (
+    BINARY_SENSOR_BACKUP_SCHEMA,
+    COMMON_BACKUP_SCHEMA,
+    CONF_DELAY_OFF,
+    CONF_DELAY_ON,
+    CONF_VOTE,
+    VOTE_ALL,
+    VOTE_ANY,
+)
+from .timer import async_get_timer_queue
+
+PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(COMMON_BACKUP_SCHEMA).extend(
+    BINARY_SENSOR_BACKUP_SCHEMA
+)
+
+# Votes of sources by their states
+VOTES = {STATE_ON: 1, STATE_OFF: -1}
 
 
 async def async_setup_platform(
     hass: HomeAssistant,
     config: ConfigType,
     async_add_entities: AddEntitiesCallback,
-    discovery_info: DiscoveryInfoType | None = None,  # noqa: ARG001
+    discovery_info: DiscoveryInfoType | None = None,
 ) -> None:
     """Set up the backup sensor."""
+    if discovery_info is not None:
+        async_add_entities(
+            BackupSourceBinarySensor(hass, entity_config)
+            for entity_config in discovery_info[CONF_ENTITIES]
+        )
+        return
+
     async_add_entities([BackupSourceBinarySensor(hass, config)])
 
 
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: BackupSourceConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the backup binary sensor from a config entry."""
+    entity = BackupSourceBinarySensor(hass, entry_config(entry, PLATFORM_SCHEMA))
+    entry.runtime_data = entity
+    async_add_entities([entity])
+
+
 class BackupSourceBinarySensor(BackupSourceEntity, BinarySensorEntity):
     """Backup Source Binary Sensor class."""
 
+    def __init__(self, hass: HomeAssistant, config: ConfigType) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(hass, config)
+
+        # Votes of sources with a value are counted, so every event updates
+        # the result in O(1) without rescanning all sources
+        self.vote: str | None = config.get(CONF_VOTE)
+        self._votes: list[int] = []
+        self._on_count = 0
+        self._off_count = 0
+
+        # Changes of the result are published only if they last long enough
+        delay_on = config.get(CONF_DELAY_ON)
+        delay_off = config.get(CONF_DELAY_OFF)
+        self._delays = {
+            STATE_ON: delay_on.total_seconds() if delay_on else 0.0,
+            STATE_OFF: delay_off.total_seconds() if delay_off else 0.0,
+        }
+        self._output: str | None = None
+        self._pending: TimerEntry | None = None
+        self._voted: tuple[State | None, str | None, State | None] = (None, None, None)
+
+    @staticmethod
+    def _vote_of(state: State | None, *, eligible: bool) -> int:
+        """Return vote of source: 1 if on, -1 if off and 0 if it has none."""
+        return VOTES.get(state.state, 0) if eligible and state is not None else 0
+
+    def _count(self, vote: int, delta: int) -> None:
+        """Add delta to the counter of votes."""
+        if vote > 0:
+            self._on_count += delta
+        elif vote < 0:
+            self._off_count += delta
+
+    @callback
+    def _async_reset_selection(self) -> None:
+        """Rebuild selection data from cached states of all sources."""
+        super()._async_reset_selection()
+        if self.vote is None:
+            return
+
+        self._votes = [
+            self._vote_of(state, eligible=self._engine.is_eligible(index))
+            for index, state in enumerate(self._source_states)
+        ]
+        self._on_count = self._votes.count(1)
+        self._off_count = self._votes.count(-1)
+
+    @callback
+    def _async_update_source(
+        self, index: int, state: State | None, *, eligible: bool
+    ) -> None:
+        """Update selection data from a new state of a single source."""
+        super()._async_update_source(index, state, eligible=eligible)
+        if self.vote is None:
+            return
+
+        vote = self._vote_of(state, eligible=eligible)
+        self._count(self._votes[index], -1)
+        self._count(vote, 1)
+        self._votes[index] = vote
+
+    def _result(self, state: State) -> str | None:
+        """Return on/off result of voting or None if no source has voted."""
+        if self.vote is None:
+            return state.state if state.state in VOTES else None
+
+        on_count = self._on_count
+        if not on_count and not self._off_count:
+            return None
+        if self.vote == VOTE_ANY:
+            is_on = on_count > 0
+        elif self.vote == VOTE_ALL:
+            is_on = not self._off_count
+        else:
+            is_on = on_count >= self._quorum
+        return STATE_ON if is_on else STATE_OFF
+
+    @callback
+    def _async_compose(self, state: State) -> State:
+        """Return selected state with value replaced by result of voting."""
+        if self.vote is None and not any(self._delays.values()):
+            return state
+
+        result = self._result(state)
+        if result is None:
+            # Nothing to vote for, so pass selected state through immediately.
+            # Last output is kept, so a result after an outage is delayed too
+            self._async_cancel_pending()
+            return state
+
+        delay = self._delays[result]
+        if result == self._output or self._output is None or not delay:
+            self._async_cancel_pending()
+            self._output = result
+        elif self._pending is None or not self._pending.active:
+            self._pending = async_get_timer_queue(self.hass).async_schedule(
+                dt_util.utcnow().timestamp() + delay,
+                partial(self._async_settle, result),
+            )
+        return self._composed(state, self._output)
+
+    def _composed(self, state: State, value: str) -> State:
+        """Return state with value replaced by result of voting."""
+        if state.state == value:
+            return state
+
+        # Reuse composed state while neither its base nor the value changes
+        base, last_value, composed = self._voted
+        if composed is not None and base is state and last_value == value:
+            return composed
+
+        composed = State(
+            state.entity_id, value, state.attributes, validate_entity_id=False
+        )
+        self._voted = (state, value, composed)
+        return composed
+
+    @callback
+    def _async_cancel_pending(self) -> None:
+        """Cancel pending change of the result."""
+        if self._pending is not None:
+            async_get_timer_queue(self.hass).async_cancel(self._pending)
+            self._pending = None
+
+    @callback
+    def _async_settle(self, result: str) -> None:
+        """Publish the result which has lasted for its delay."""
+        self._pending = None
+        self._output = result
+        last_state = self._state
+        self._async_select()
+        if last_state is not self._state:
+            self._async_schedule_publish()
+
+    @callback
+    def _async_cancel_timers(self) -> None:
+        """Cancel all scheduled timers of the entity."""
+        super()._async_cancel_timers()
+        self._async_cancel_pending()
+
     @property
     def is_on(self) -> bool | None:
         """Return true if the binary sensor is on."""
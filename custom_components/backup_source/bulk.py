@@ -0,0 +1,167 @@
+#  Copyright (c) 2024, Andrey "Limych" Khrolenok <andrey@khrolenok.ru>
+#  Creative Commons BY-NC-SA 4.0 International Public License
+#  (see LICENSE.md or https://creativecommons.org/licenses/by-nc-sa/4.0/)
+"""Bulk definitions of backup entities for backup_source."""
+
+from __future__ import annotations
+
+import fnmatch
+import logging
+import re
+from typing import TYPE_CHECKING
+
+from homeassistant.const import CONF_NAME, CONF_UNIQUE_ID
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+
+if TYPE_CHECKING:  # pragma: no cover
+    from homeassistant.helpers.typing import ConfigType
+
+from .const import CONF_FOR_EACH, CONF_SOURCES, DATA_ENTITIES, DOMAIN, FOR_EACH_AREA
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+# Placeholder of area name in names of entities expanded for each area
+AREA_PLACEHOLDER = "{area}"
+
+WILDCARDS = re.compile(r"[*?\[]")
+
+
+@callback
+def async_expand_rules(
+    hass: HomeAssistant, config: ConfigType
+) -> dict[str, list[ConfigType]]:
+    """Return configs of backup entities of each platform expanded from rules."""
+    expander = RuleExpander(hass)
+    return {
+        platform: [
+            entity_config for rule in rules for entity_config in expander.expand(rule)
+        ]
+        for platform, rules in config.items()
+    }
+
+
+class RuleExpander:
+    """
+    Expander of bulk rules into configs of backup entities.
+
+    Patterns are matched against entities known to the entity registry or
+    present in the state machine. Each distinct pattern is matched only once,
+    so rules sharing patterns (e.g. rules expanded for each area) do not
+    rescan entities.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Collect candidate entities and their areas."""
+        devices = dr.async_get(hass)
+        excluded = set(hass.data.get(DOMAIN, {}).get(DATA_ENTITIES, {}))
+        self._areas: dict[str, str | None] = {}
+        for entry in er.async_get(hass).entities.values():
+            if entry.platform == DOMAIN or entry.disabled_by is not None:
+                excluded.add(entry.entity_id)
+                continue
+            area_id = entry.area_id
+            if (
+                area_id is None
+                and entry.device_id is not None
+                and (device := devices.async_get(entry.device_id)) is not None
+            ):
+                area_id = device.area_id
+            self._areas[entry.entity_id] = area_id
+
+        self._area_registry = ar.async_get(hass)
+        self._candidates = sorted(
+            (self._areas.keys() | set(hass.states.async_entity_ids())) - excluded
+        )
+        self._matches: dict[str, list[str]] = {}
+
+    def _match(self, pattern: str) -> list[str]:
+        """Return entities matching pattern; literal entity IDs match themselves."""
+        if (matches := self._matches.get(pattern)) is None:
+            if WILDCARDS.search(pattern) is None:
+                matches = [pattern]
+            else:
+                regex = re.compile(fnmatch.translate(pattern))
+                matches = [
+                    entity_id
+                    for entity_id in self._candidates
+                    if regex.match(entity_id)
+                ]
+            self._matches[pattern] = matches
+        return matches
+
+    def _sources(
+        self, patterns: list[str | list[str]], area_id: str | None = None
+    ) -> list[str | list[str]]:
+        """
+        Return sources matching patterns in their priority order.
+
+        Matches of a single pattern follow each other by entity ID, matches
+        of patterns listed together share a priority. If area is given,
+        patterns match entities of that area only, while literal entity IDs
+        are used for every area.
+        """
+        seen: set[str] = set()
+        sources: list[str | list[str]] = []
+        for entry in patterns:
+            matched = []
+            for pattern in entry if isinstance(entry, list) else [entry]:
+                is_literal = WILDCARDS.search(pattern) is None
+                for entity_id in self._match(pattern):
+                    if entity_id in seen or (
+                        area_id is not None
+                        and not is_literal
+                        and self._areas.get(entity_id) != area_id
+                    ):
+                        continue
+                    seen.add(entity_id)
+                    matched.append(entity_id)
+            if isinstance(entry, list):
+                if matched:
+                    sources.append(matched)
+            else:
+                sources.extend(matched)
+        return sources
+
+    def _rule_areas(self, patterns: list[str | list[str]]) -> list[ar.AreaEntry]:
+        """Return areas having entities matching patterns, ordered by name."""
+        area_ids = {
+            self._areas.get(entity_id)
+            for entry in patterns
+            for pattern in (entry if isinstance(entry, list) else [entry])
+            if WILDCARDS.search(pattern) is not None
+            for entity_id in self._match(pattern)
+        }
+        areas = [
+            area
+            for area_id in area_ids
+            if area_id is not None
+            and (area := self._area_registry.async_get_area(area_id)) is not None
+        ]
+        return sorted(areas, key=lambda area: area.name)
+
+    def expand(self, rule: ConfigType) -> list[ConfigType]:
+        """Return configs of backup entities expanded from rule."""
+        config = {key: value for key, value in rule.items() if key != CONF_FOR_EACH}
+        if rule.get(CONF_FOR_EACH) != FOR_EACH_AREA:
+            if not (sources := self._sources(rule[CONF_SOURCES])):
+                _LOGGER.warning('No sources match rule "%s"', rule[CONF_NAME])
+                return []
+            return [{**config, CONF_SOURCES: sources}]
+
+        configs = []
+        for area in self._rule_areas(rule[CONF_SOURCES]):
+            name = rule[CONF_NAME]
+            entity_config = {
+                **config,
+                CONF_NAME: name.replace(AREA_PLACEHOLDER, area.name)
+                if AREA_PLACEHOLDER in name
+                else f"{area.name} {name}",
+                CONF_SOURCES: self._sources(rule[CONF_SOURCES], area.id),
+            }
+            if (unique_id := rule.get(CONF_UNIQUE_ID)) is not None:
+                entity_config[CONF_UNIQUE_ID] = f"{unique_id}_{area.id}"
+            configs.append(entity_config)
+        return configs
@@ -0,0 +1,134 @@
+#  Copyright (c) 2024, Andrey "Limych" Khrolenok <andrey@khrolenok.ru>
+#  Creative Commons BY-NC-SA 4.0 International Public License
+#  (see LICENSE.md or https://creativecommons.org/licenses/by-nc-sa/4.0/)
+"""Config flow for backup_source."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntry, ConfigFlow, OptionsFlow
+from homeassistant.const import CONF_NAME, CONF_PLATFORM
+from homeassistant.core import callback
+from homeassistant.helpers import selector
+
+if TYPE_CHECKING:  # pragma: no cover
+    from homeassistant.config_entries import ConfigFlowResult
+
+from .const import CONF_SKIP_NO_VALUE, CONF_SOURCES, DOMAIN, PLATFORMS
+
+GROUP_DOMAIN = "group"
+
+
+def _sources_schema(platform: str, defaults: dict[str, Any]) -> vol.Schema:
+    """Return schema of sources form."""
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_SOURCES, default=defaults.get(CONF_SOURCES, [])
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain=[platform, GROUP_DOMAIN], multiple=True
+                )
+            ),
+            vol.Required(
+                CONF_SKIP_NO_VALUE, default=defaults.get(CONF_SKIP_NO_VALUE, True)
+            ): selector.BooleanSelector(),
+        }
+    )
+
+
+def _validate_sources(user_input: dict[str, Any]) -> dict[str, str]:
+    """Return errors of sources form."""
+    if not user_input[CONF_SOURCES]:
+        return {CONF_SOURCES: "no_sources"}
+    return {}
+
+
+class BackupSourceFlowHandler(ConfigFlow, domain=DOMAIN):
+    """Config flow for backup_source."""
+
+    VERSION = 1
+
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        self._data: dict[str, Any] = {}
+
+    async def async_step_user(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle a flow initialized by the user."""
+        if user_input is not None:
+            self._data = user_input
+            return await self.async_step_sources()
+
+        return self.async_show_form(
+            step_id="user",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_NAME): selector.TextSelector(),
+                    vol.Required(
+                        CONF_PLATFORM, default=PLATFORMS[0]
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[str(platform) for platform in PLATFORMS],
+                            translation_key=CONF_PLATFORM,
+                        )
+                    ),
+                }
+            ),
+        )
+
+    async def async_step_sources(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle selection of sources."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            errors = _validate_sources(user_input)
+            if not errors:
+                return self.async_create_entry(
+                    title=self._data[CONF_NAME],
+                    data={CONF_PLATFORM: self._data[CONF_PLATFORM]},
+                    options=user_input,
+                )
+
+        return self.async_show_form(
+            step_id="sources",
+            data_schema=_sources_schema(self._data[CONF_PLATFORM], user_input or {}),
+            errors=errors,
+        )
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get component options flow."""
+        return BackupSourceOptionsFlowHandler(config_entry)
+
+
+class BackupSourceOptionsFlowHandler(OptionsFlow):
+    """Options flow for backup_source."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialize the flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            errors = _validate_sources(user_input)
+            if not errors:
+                return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=_sources_schema(
+                self.config_entry.data[CONF_PLATFORM],
+                user_input or dict(self.config_entry.options),
+            ),
+            errors=errors,
+        )
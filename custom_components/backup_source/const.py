@@ -3,11 +3,25 @@
 #  (see LICENSE.md or https://creativecommons.org/licenses/by-nc-sa/4.0/)
 """Constants for backup_source."""
 
-from typing import Final
+from datetime import timedelta
+from typing import Any, Final
 
 import voluptuous as vol
-from homeassistant.const import CONF_NAME, CONF_UNIQUE_ID, Platform
+from homeassistant.const import (
+    CONF_ATTRIBUTE,
+    CONF_ENTITY_ID,
+    CONF_EXCLUDE,
+    CONF_INCLUDE,
+    CONF_NAME,
+    CONF_OFFSET,
+    CONF_UNIQUE_ID,
+    CONF_UNIT_OF_MEASUREMENT,
+    CONF_VALUE_TEMPLATE,
+    Platform,
+)
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.template import Template
+from jinja2 import Environment, TemplateSyntaxError, meta
 
 # Base component constants
 NAME: Final = "Backup Source"
@@ -33,17 +47,271 @@ PLATFORMS: Final = [
     Platform.WEATHER,
 ]
 
+# Services
+SERVICE_GET_METRICS: Final = "get_metrics"
+
 # Configuration and options
 CONF_SOURCES: Final = "sources"
 CONF_SKIP_NO_VALUE: Final = "skip_no_value"
+CONF_CHANGE_DETECTION: Final = "change_detection"
+CONF_ATTRIBUTES: Final = "attributes"
+CONF_DEBOUNCE: Final = "debounce"
+CONF_MIN_HOLD_TIME: Final = "min_hold_time"
+CONF_FAILBACK_DELAY: Final = "failback_delay"
+CONF_MAX_AGE: Final = "max_age"
+CONF_STRATEGY: Final = "strategy"
+CONF_TOLERANCE: Final = "tolerance"
+CONF_QUORUM: Final = "quorum"
+CONF_ADAPTIVE: Final = "adaptive"
+CONF_HEALTH_HALF_LIFE: Final = "health_half_life"
+CONF_FORECAST_TTL: Final = "forecast_ttl"
+CONF_MERGE: Final = "merge"
+CONF_FOR_EACH: Final = "for_each"
+CONF_VOTE: Final = "vote"
+CONF_DELAY_ON: Final = "delay_on"
+CONF_DELAY_OFF: Final = "delay_off"
+CONF_VALID_IF: Final = "valid_if"
+CONF_NUMERIC: Final = "numeric"
+CONF_MIN: Final = "min"
+CONF_MAX: Final = "max"
+CONF_PRIORITY: Final = "priority"
+CONF_SCALE: Final = "scale"
+
+# Selection strategies
+STRATEGY_FIRST: Final = "first"
+STRATEGY_FRESHEST: Final = "freshest"
+STRATEGY_MEDIAN: Final = "median"
+STRATEGY_MEAN: Final = "mean"
+STRATEGY_QUORUM: Final = "quorum"
+STRATEGIES: Final = [
+    STRATEGY_FIRST,
+    STRATEGY_FRESHEST,
+]
+NUMERIC_STRATEGIES: Final = [
+    STRATEGY_MEDIAN,
+    STRATEGY_MEAN,
+    STRATEGY_QUORUM,
+]
+
+# Voting modes of binary sensors
+VOTE_ANY: Final = "any"
+VOTE_ALL: Final = "all"
+VOTE_QUORUM: Final = "quorum"
+VOTE_MODES: Final = [
+    VOTE_ANY,
+    VOTE_ALL,
+    VOTE_QUORUM,
+]
+
+# Defaults
+DEFAULT_QUORUM: Final = 2
+DEFAULT_HEALTH_HALF_LIFE: Final = timedelta(hours=6)
+DEFAULT_FORECAST_TTL: Final = timedelta(minutes=10)
+
+# Modes of expansion of bulk rules
+FOR_EACH_AREA: Final = "area"
+FOR_EACH_MODES: Final = [
+    FOR_EACH_AREA,
+]
+
+# Change detection modes
+CHANGE_DETECTION_FULL: Final = "full"
+CHANGE_DETECTION_EXPOSED: Final = "exposed"
+CHANGE_DETECTION_VALUE: Final = "value"
+CHANGE_DETECTION_MODES: Final = [
+    CHANGE_DETECTION_FULL,
+    CHANGE_DETECTION_EXPOSED,
+    CHANGE_DETECTION_VALUE,
+]
+
+# Keys of integration data in hass.data[DOMAIN]
+DATA_DISPATCHER: Final = "dispatcher"
+DATA_REPORT_DISPATCHER: Final = "report_dispatcher"
+DATA_TIMER_QUEUE: Final = "timer_queue"
+DATA_ENTITIES: Final = "entities"
+DATA_HEALTH: Final = "health"
+DATA_HISTORY: Final = "history"
 
 # Attributes
 ATTR_SOURCE: Final = "source"
 
 # Common schemas
+ATTRIBUTES_SCHEMA: Final = vol.Schema(
+    {
+        vol.Optional(CONF_INCLUDE): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(CONF_EXCLUDE): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+# Variables of validity templates; results are cached per state of source,
+# so templates may not read other entities or time
+VALID_IF_VARIABLES: Final = frozenset(("state", "value"))
+
+# Templates are only parsed here to find names of their variables
+_JINJA_ENV: Final = Environment(autoescape=True, extensions=["jinja2.ext.loopcontrols"])
+
+
+def valid_if_template(value: Any) -> Template:
+    """Validate template of validity rule using only the source state."""
+    template = cv.template(value)
+    try:
+        names = meta.find_undeclared_variables(_JINJA_ENV.parse(template.template))
+    except TemplateSyntaxError as exc:
+        msg = f"invalid template ({exc})"
+        raise vol.Invalid(msg) from exc
+    if unknown := names - VALID_IF_VARIABLES - _JINJA_ENV.globals.keys():
+        msg = (
+            "template may only use variables "
+            f"{', '.join(sorted(VALID_IF_VARIABLES))}, "
+            f"got: {', '.join(sorted(unknown))}"
+        )
+        raise vol.Invalid(msg)
+    return template
+
+
+# A state with a value is valid only if it passes all rules
+VALID_IF_SCHEMA: Final = vol.All(
+    cv.ensure_list,
+    [
+        vol.Schema(
+            {
+                vol.Optional(CONF_ATTRIBUTE): cv.string,
+                vol.Optional(CONF_NUMERIC): cv.boolean,
+                vol.Optional(CONF_MIN): vol.Coerce(float),
+                vol.Optional(CONF_MAX): vol.Coerce(float),
+                vol.Optional(CONF_EXCLUDE): vol.All(cv.ensure_list, [cv.string]),
+                vol.Optional(CONF_VALUE_TEMPLATE): valid_if_template,
+            }
+        )
+    ],
+)
+
+# Options of a single source override ones of the entity
+SOURCE_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(CONF_ENTITY_ID): cv.entity_id,
+        vol.Optional(CONF_PRIORITY): vol.Coerce(int),
+        vol.Optional(CONF_SKIP_NO_VALUE): cv.boolean,
+        vol.Optional(CONF_MAX_AGE): cv.positive_time_period,
+        vol.Optional(CONF_VALID_IF): VALID_IF_SCHEMA,
+    }
+)
+
+# Values of sources can be rescaled for sensors only
+SENSOR_SOURCE_SCHEMA: Final = SOURCE_SCHEMA.extend(
+    {
+        vol.Optional(CONF_SCALE): vol.Coerce(float),
+        vol.Optional(CONF_OFFSET): vol.Coerce(float),
+    }
+)
+
+
+def _sources_schema(source_schema: vol.Schema) -> vol.All:
+    """
+    Return schema of a list of sources.
+
+    Sources listed together in a nested list share the same priority tier,
+    and so do sources with equal priority option; sources with higher
+    priority option go first regardless of their place.
+    """
+    return vol.All(
+        cv.ensure_list_csv,
+        [
+            vol.Any(
+                cv.entity_id,
+                source_schema,
+                vol.All(
+                    cv.ensure_list,
+                    vol.Length(min=1),
+                    [vol.Any(cv.entity_id, source_schema)],
+                ),
+            )
+        ],
+    )
+
+
+SOURCES_SCHEMA: Final = _sources_schema(SOURCE_SCHEMA)
+SENSOR_SOURCES_SCHEMA: Final = _sources_schema(SENSOR_SOURCE_SCHEMA)
+
 COMMON_BACKUP_SCHEMA: Final = {
     vol.Required(CONF_NAME): cv.string,
-    vol.Required(CONF_SOURCES): cv.entity_ids,
+    vol.Required(CONF_SOURCES): SOURCES_SCHEMA,
     vol.Optional(CONF_UNIQUE_ID): cv.string,
     vol.Optional(CONF_SKIP_NO_VALUE, default=True): cv.boolean,
+    vol.Optional(CONF_VALID_IF): VALID_IF_SCHEMA,
+    vol.Optional(CONF_CHANGE_DETECTION, default=CHANGE_DETECTION_EXPOSED): vol.In(
+        CHANGE_DETECTION_MODES
+    ),
+    vol.Optional(CONF_ATTRIBUTES): ATTRIBUTES_SCHEMA,
+    vol.Optional(CONF_DEBOUNCE): cv.positive_time_period,
+    vol.Optional(CONF_MIN_HOLD_TIME): cv.positive_time_period,
+    vol.Optional(CONF_FAILBACK_DELAY): cv.positive_time_period,
+    vol.Optional(CONF_MAX_AGE): cv.positive_time_period,
+    vol.Optional(CONF_STRATEGY, default=STRATEGY_FIRST): vol.In(STRATEGIES),
+    vol.Optional(CONF_ADAPTIVE, default=False): cv.boolean,
+    vol.Optional(
+        CONF_HEALTH_HALF_LIFE, default=DEFAULT_HEALTH_HALF_LIFE
+    ): cv.positive_time_period,
+}
+
+# Numeric strategies and unit normalization are available for sensors only
+SENSOR_BACKUP_SCHEMA: Final = {
+    vol.Required(CONF_SOURCES): SENSOR_SOURCES_SCHEMA,
+    vol.Optional(CONF_STRATEGY, default=STRATEGY_FIRST): vol.In(
+        STRATEGIES + NUMERIC_STRATEGIES
+    ),
+    vol.Optional(CONF_TOLERANCE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional(CONF_QUORUM, default=DEFAULT_QUORUM): cv.positive_int,
+    vol.Optional(CONF_UNIT_OF_MEASUREMENT): cv.string,
+}
+
+# Voting and delays are available for binary sensors only
+BINARY_SENSOR_BACKUP_SCHEMA: Final = {
+    vol.Optional(CONF_VOTE): vol.In(VOTE_MODES),
+    vol.Optional(CONF_QUORUM, default=DEFAULT_QUORUM): cv.positive_int,
+    vol.Optional(CONF_DELAY_ON): cv.positive_time_period,
+    vol.Optional(CONF_DELAY_OFF): cv.positive_time_period,
 }
+
+# Forecast caching and merging of fields are available for weather only
+WEATHER_BACKUP_SCHEMA: Final = {
+    vol.Optional(
+        CONF_FORECAST_TTL, default=DEFAULT_FORECAST_TTL
+    ): cv.positive_time_period,
+    vol.Optional(CONF_MERGE, default=False): cv.boolean,
+}
+
+# Sources of bulk rules are patterns of entity IDs
+PATTERNS_SCHEMA: Final = vol.All(
+    cv.ensure_list_csv,
+    [
+        vol.Any(
+            vol.All(cv.string, vol.Lower),
+            vol.All(cv.ensure_list, vol.Length(min=1), [vol.All(cv.string, vol.Lower)]),
+        )
+    ],
+)
+
+BULK_RULE_SCHEMA: Final = {
+    vol.Required(CONF_SOURCES): PATTERNS_SCHEMA,
+    vol.Optional(CONF_FOR_EACH): vol.In(FOR_EACH_MODES),
+}
+
+
+def _rules_schema(*schemas: dict) -> vol.All:
+    """Return schema of a list of bulk rules of a platform."""
+    schema = vol.Schema(COMMON_BACKUP_SCHEMA)
+    for extension in (*schemas, BULK_RULE_SCHEMA):
+        schema = schema.extend(extension)
+    return vol.All(cv.ensure_list, [schema])
+
+
+BULK_SCHEMA: Final = vol.Schema(
+    {
+        vol.Optional(Platform.BINARY_SENSOR.value): _rules_schema(
+            BINARY_SENSOR_BACKUP_SCHEMA
+        ),
+        vol.Optional(Platform.SENSOR.value): _rules_schema(SENSOR_BACKUP_SCHEMA),
+        vol.Optional(Platform.WEATHER.value): _rules_schema(WEATHER_BACKUP_SCHEMA),
+    }
+)
@@ -0,0 +1,139 @@
+#  Copyright (c) 2024, Andrey "Limych" Khrolenok <andrey@khrolenok.ru>
+#  Creative Commons BY-NC-SA 4.0 International Public License
+#  (see LICENSE.md or https://creativecommons.org/licenses/by-nc-sa/4.0/)
+"""Shared state change dispatcher for backup_source."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_STATE_REPORTED
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable, Iterable
+
+from .const import DATA_DISPATCHER, DATA_REPORT_DISPATCHER, DOMAIN
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+
+_DATA_KEYS = {
+    EVENT_STATE_CHANGED: DATA_DISPATCHER,
+    EVENT_STATE_REPORTED: DATA_REPORT_DISPATCHER,
+}
+
+
+@callback
+def async_get_dispatcher(
+    hass: HomeAssistant, event_type: str = EVENT_STATE_CHANGED
+) -> SourceDispatcher:
+    """
+    Return integration-wide dispatcher, creating it if needed.
+
+    Listeners of the EVENT_STATE_REPORTED dispatcher also receive all state
+    changes, so they don't need to subscribe to both dispatchers.
+    """
+    data = hass.data.setdefault(DOMAIN, {})
+    key = _DATA_KEYS[event_type]
+    if (dispatcher := data.get(key)) is None:
+        dispatcher = data[key] = SourceDispatcher(hass, event_type)
+    return dispatcher
+
+
+class SourceDispatcher:
+    """
+    Route state changes of source entities to backup entities.
+
+    All backup entities share one state change listener. The dispatcher keeps
+    a reverse index from a source entity_id to listeners of backup entities
+    which depend on it, so every event is routed exactly once. Lists of
+    listeners are replaced rather than mutated, so they can be iterated
+    without copying while listeners subscribe or unsubscribe.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, event_type: str = EVENT_STATE_CHANGED
+    ) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        self.event_type = event_type
+        self._listeners: dict[str, tuple[Callable, ...]] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @property
+    def entity_ids(self) -> set[str]:
+        """Return entity IDs of all tracked sources."""
+        return set(self._listeners)
+
+    @callback
+    def async_subscribe(
+        self,
+        entity_ids: Iterable[str],
+        listener: Callable[[Event[EventStateChangedData]], None],
+    ) -> CALLBACK_TYPE:
+        """Subscribe listener to state changes of entities; return unsubscriber."""
+        entity_ids = tuple(dict.fromkeys(entity_ids))
+        for entity_id in entity_ids:
+            self._listeners[entity_id] = (
+                *self._listeners.get(entity_id, ()),
+                listener,
+            )
+
+        if self._unsub is None and self._listeners:
+            self._unsub = self.hass.bus.async_listen(
+                self.event_type,
+                self._async_dispatch,
+                event_filter=self._async_filter,
+            )
+
+        @callback
+        def _async_unsubscribe() -> None:
+            self.async_unsubscribe(entity_ids, listener)
+
+        return _async_unsubscribe
+
+    @callback
+    def async_unsubscribe(
+        self,
+        entity_ids: Iterable[str],
+        listener: Callable[[Event[EventStateChangedData]], None],
+    ) -> None:
+        """Unsubscribe listener from state changes of entities."""
+        for entity_id in entity_ids:
+            listeners = tuple(
+                x for x in self._listeners.get(entity_id, ()) if x != listener
+            )
+            if listeners:
+                self._listeners[entity_id] = listeners
+            else:
+                self._listeners.pop(entity_id, None)
+
+        if self._unsub is not None and not self._listeners:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_filter(self, event_data: EventStateChangedData) -> bool:
+        """Filter state changes by entity_id."""
+        return event_data["entity_id"] in self._listeners
+
+    @callback
+    def _async_dispatch(self, event: Event[EventStateChangedData]) -> None:
+        """Dispatch state change to listeners."""
+        for listener in self._listeners.get(event.data["entity_id"], ()):
+            try:
+                listener(event)
+            except Exception:
+                _LOGGER.exception(
+                    "Error while dispatching event for %s to %s",
+                    event.data["entity_id"],
+                    listener,
+                )
@@ -0,0 +1,73 @@
+#  Copyright (c) 2024, Andrey "Limych" Khrolenok <andrey@khrolenok.ru>
+#  Creative Commons BY-NC-SA 4.0 International Public License
+#  (see LICENSE.md or https://creativecommons.org/licenses/by-nc-sa/4.0/)
+"""Failover engine for backup_source."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterable
+
+
+def lowest_bit(mask: int) -> int:
+    """Return index of the lowest set bit of mask or -1 if mask is empty."""
+    return (mask & -mask).bit_length() - 1
+
+
+class FailoverEngine:
+    """
+    Priority-indexed selection of the active source.
+
+    Sources are addressed by their index in the list of sources, where index 0
+    has the highest priority. Sources which currently have a usable value are
+    kept as a bitmap, so any change of a single source is handled in O(1)
+    without rescanning all other sources.
+    """
+
+    __slots__ = ("_mask", "active")
+
+    def __init__(self) -> None:
+        """Initialize the engine."""
+        self._mask = 0
+        self.active = -1
+
+    @property
+    def mask(self) -> int:
+        """Return bitmap of sources that have a usable value."""
+        return self._mask
+
+    def reset(self, eligible: Iterable[bool]) -> int:
+        """Rebuild engine state from eligibility flags of all sources."""
+        mask = 0
+        for index, flag in enumerate(eligible):
+            if flag:
+                mask |= 1 << index
+        self._mask = mask
+        self.active = lowest_bit(mask)
+        return self.active
+
+    def is_eligible(self, index: int) -> bool:
+        """Return True if source at index has a usable value."""
+        return bool(self._mask >> index & 1)
+
+    def update(self, index: int, eligible: bool) -> bool:  # noqa: FBT001
+        """
+        Update eligibility of one source.
+
+        Return True if the active source has changed.
+        """
+        bit = 1 << index
+        if eligible:
+            self._mask |= bit
+            if self.active < 0 or index < self.active:
+                self.active = index
+                return True
+            return False
+
+        self._mask &= ~bit
+        if index != self.active:
+            return False
+        self.active = lowest_bit(self._mask)
+        return True
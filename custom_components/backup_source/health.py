@@ -0,0 +1,159 @@
+#  Copyright (c) 2024, Andrey "Limych" Khrolenok <andrey@khrolenok.ru>
+#  Creative Commons BY-NC-SA 4.0 International Public License
+#  (see LICENSE.md or https://creativecommons.org/licenses/by-nc-sa/4.0/)
+"""Health scoring of sources for backup_source."""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+if TYPE_CHECKING:  # pragma: no cover
+    import asyncio
+
+from .const import DATA_HEALTH, DOMAIN
+
+STORAGE_KEY = f"{DOMAIN}.health"
+STORAGE_VERSION = 1
+
+# Interval of writing changed scores to storage, in seconds
+SAVE_DELAY = 60
+
+# Availability ratio by which another source must be healthier to switch to it
+SCORE_MARGIN = 0.05
+
+
+async def async_get_health_store(hass: HomeAssistant) -> HealthStore:
+    """Return integration-wide store of health scores, loading it if needed."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if (store := data.get(DATA_HEALTH)) is None:
+        store = data[DATA_HEALTH] = HealthStore(hass)
+    await store.async_load()
+    return store
+
+
+class SourceHealth:
+    """
+    Health score of a single source.
+
+    Availability ratio and update rate are exponentially decayed averages
+    over time, so each event updates them in O(1) without keeping history.
+    """
+
+    __slots__ = ("availability", "available", "rate", "updated")
+
+    def __init__(
+        self,
+        availability: float = 1.0,
+        rate: float = 0.0,
+        updated: float = 0.0,
+        available: bool = False,  # noqa: FBT001, FBT002
+    ) -> None:
+        """Initialize the score."""
+        self.availability = availability
+        self.rate = rate
+        self.updated = updated
+        self.available = available
+
+    def _decay(self, timestamp: float, half_life: float) -> float:
+        """Return weight of the past at timestamp."""
+        return 0.5 ** (max(0.0, timestamp - self.updated) / half_life)
+
+    def update(
+        self, timestamp: float, half_life: float, *, available: bool, count: bool = True
+    ) -> None:
+        """
+        Account update of source at timestamp.
+
+        Updates which are not counted (e.g. on reload of the entity) change
+        availability only and don't add to the update rate.
+        """
+        if self.updated:
+            decay = self._decay(timestamp, half_life)
+            self.availability = self.availability * decay + (1 - decay) * float(
+                self.available
+            )
+            self.rate *= decay
+            if count:
+                self.rate += math.log(2) / half_life
+        self.updated = timestamp
+        self.available = available
+
+    def score(self, timestamp: float, half_life: float) -> tuple[float, float]:
+        """Return availability ratio and update rate at timestamp."""
+        if not self.updated:
+            return (self.availability, self.rate)
+
+        decay = self._decay(timestamp, half_life)
+        return (
+            self.availability * decay + (1 - decay) * float(self.available),
+            self.rate * decay,
+        )
+
+    def as_list(self) -> list[Any]:
+        """Return score as a list to store."""
+        return [self.availability, self.rate, self.updated, self.available]
+
+
+class HealthStore:
+    """Persistent health scores of sources of all backup entities."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self._store: Store[dict[str, dict[str, list]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._records: dict[str, dict[str, SourceHealth]] = {}
+        self._dirty = False
+        self._load_task: asyncio.Task | None = None
+
+    async def async_load(self) -> None:
+        """Load scores from storage once."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load())
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        """Load scores from storage."""
+        data = await self._store.async_load() or {}
+        for entity_id, sources in data.items():
+            records = self._records.setdefault(entity_id, {})
+            for source, values in sources.items():
+                records.setdefault(source, SourceHealth(*values))
+
+    @callback
+    def async_get_records(
+        self, entity_id: str, sources: list[str]
+    ) -> list[SourceHealth]:
+        """Return scores of sources of entity, dropping scores of other ones."""
+        records = self._records.setdefault(entity_id, {})
+        for source in records.keys() - set(sources):
+            del records[source]
+        return [records.setdefault(source, SourceHealth()) for source in sources]
+
+    @callback
+    def async_mark_dirty(self) -> None:
+        """
+        Mark scores as changed.
+
+        The first change schedules a write and later ones don't push it
+        back, so scores are written at most SAVE_DELAY after they change.
+        Pending write is flushed by the store on Home Assistant stop.
+        """
+        if not self._dirty:
+            self._dirty = True
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, list]]:
+        """Return data of scores to store."""
+        self._dirty = False
+        return {
+            entity_id: {source: health.as_list() for source, health in records.items()}
+            for entity_id, records in self._records.items()
+            if records
+        }
@@ -0,0 +1,138 @@
+#  Copyright (c) 2024, Andrey "Limych" Khrolenok <andrey@khrolenok.ru>
+#  Creative Commons BY-NC-SA 4.0 International Public License
+#  (see LICENSE.md or https://creativecommons.org/licenses/by-nc-sa/4.0/)
+"""Backfill of source states from recorded history for backup_source."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.components.recorder import get_instance, history
+from homeassistant.core import HomeAssistant, State, callback
+from homeassistant.helpers.recorder import async_wait_recorder
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterable
+
+from .const import DATA_HISTORY, DOMAIN
+from .source import has_value
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+# Recorded history is searched back from now in growing windows, so busy
+# sources are found among a few recent rows and only quiet ones need
+# a longer window, up to the last one
+WINDOWS = (
+    timedelta(minutes=10),
+    timedelta(hours=1),
+    timedelta(hours=6),
+    timedelta(days=1),
+)
+
+# Time to wait for other entities set up concurrently to join the batch
+BATCH_DELAY = 0.5
+
+
+@callback
+def async_get_source_history(hass: HomeAssistant) -> SourceHistory:
+    """Return integration-wide backfill of source states."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if (source_history := data.get(DATA_HISTORY)) is None:
+        source_history = data[DATA_HISTORY] = SourceHistory(hass)
+    return source_history
+
+
+def _last_good_states(
+    hass: HomeAssistant, entity_ids: list[str], now: datetime
+) -> dict[str, State]:
+    """Return the last recorded state with a value of each entity."""
+    result: dict[str, State] = {}
+    missing = list(entity_ids)
+    end_time = now
+    for window in WINDOWS:
+        start_time = now - window
+        for entity_id, states in history.get_significant_states(
+            hass,
+            start_time,
+            end_time,
+            entity_ids=missing,
+            include_start_time_state=False,
+            significant_changes_only=False,
+        ).items():
+            for state in reversed(states):
+                if isinstance(state, State) and has_value(state):
+                    result[entity_id] = state
+                    break
+        if not (missing := [x for x in missing if x not in result]):
+            break
+        end_time = start_time
+    return result
+
+
+class SourceHistory:
+    """
+    Last good states of sources recorded before Home Assistant has started.
+
+    Entities register their sources when they are added, and states of all
+    sources registered until the recorder is ready and for a short delay
+    after that are loaded in one job of the recorder executor. Entities
+    added later are batched the same way.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the backfill."""
+        self.hass = hass
+        self._pending: set[str] = set()
+        self._loaded: set[str] = set()
+        self._states: dict[str, State] = {}
+        self._task: asyncio.Task | None = None
+
+    @callback
+    def async_register(self, entity_ids: Iterable[str]) -> None:
+        """Request states of entities to be loaded with the next query."""
+        self._pending.update(set(entity_ids) - self._loaded)
+
+    async def async_get_states(self, entity_ids: Iterable[str]) -> dict[str, State]:
+        """Return the last recorded good states of entities."""
+        wanted = set(entity_ids)
+        self._pending.update(wanted - self._loaded)
+        while True:
+            if self._task is not None:
+                # Waiting entity may be removed while others need the result
+                await asyncio.shield(self._task)
+            if not wanted & self._pending:
+                break
+            if self._task is None or self._task.done():
+                self._task = self.hass.async_create_task(self._async_load())
+        return {
+            entity_id: self._states[entity_id]
+            for entity_id in wanted
+            if entity_id in self._states
+        }
+
+    async def _async_load(self) -> None:
+        """Load states of all pending entities with a single job."""
+        recorder_ready = await async_wait_recorder(self.hass)
+        await asyncio.sleep(BATCH_DELAY)
+        entity_ids = sorted(self._pending)
+        self._loaded.update(entity_ids)
+        self._pending.clear()
+        if not recorder_ready:
+            return
+
+        _LOGGER.debug("Loading recorded states of %d sources", len(entity_ids))
+        try:
+            states = await get_instance(self.hass).async_add_executor_job(
+                _last_good_states,
+                self.hass,
+                entity_ids,
+                dt_util.utcnow(),
+            )
+        except Exception:
+            _LOGGER.exception("Unable to load recorded states of sources")
+            return
+        self._states.update(states)
@@ -0,0 +1,99 @@
+#  Copyright (c) 2024, Andrey "Limych" Khrolenok <andrey@khrolenok.ru>
+#  Creative Commons BY-NC-SA 4.0 International Public License
+#  (see LICENSE.md or https://creativecommons.org/licenses/by-nc-sa/4.0/)
+"""Field-level merging of source states for backup_source."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.core import State
+
+from .engine import lowest_bit
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Mapping
+
+
+class FieldMerge:
+    """
+    Composite of attributes taken from the highest priority source having them.
+
+    For every field a bitmap of sources which have a value of the field is
+    kept, so an update of one source only touches fields of that source and
+    never rescans other sources. Companion attributes (e.g. units) are always
+    taken from the same source as the field itself.
+    """
+
+    __slots__ = ("_fields", "_masks", "_providers")
+
+    def __init__(self, fields: Mapping[str, tuple[str, ...]]) -> None:
+        """Initialize the merge."""
+        self._fields = dict(fields)
+        self._masks = dict.fromkeys(self._fields, 0)
+        self._providers = dict.fromkeys(self._fields, -1)
+
+    @property
+    def providers(self) -> dict[str, int]:
+        """Return index of source providing each field or -1 if there is none."""
+        return dict(self._providers)
+
+    def reset(self, states: list[State | None], mask: int) -> None:
+        """Rebuild merge from states of all sources and bitmap of usable ones."""
+        for field in self._fields:
+            field_mask = 0
+            for index, state in enumerate(states):
+                if (
+                    mask >> index & 1
+                    and state is not None
+                    and state.attributes.get(field) is not None
+                ):
+                    field_mask |= 1 << index
+            self._masks[field] = field_mask
+            self._providers[field] = lowest_bit(field_mask)
+
+    def update(self, index: int, state: State | None, *, eligible: bool) -> bool:
+        """
+        Update fields of one source.
+
+        Return True if the composite may have changed.
+        """
+        bit = 1 << index
+        changed = False
+        for field, old_mask in self._masks.items():
+            if (
+                eligible
+                and state is not None
+                and state.attributes.get(field) is not None
+            ):
+                mask = old_mask | bit
+            else:
+                mask = old_mask & ~bit
+            self._masks[field] = mask
+            provider = lowest_bit(mask)
+            if provider != self._providers[field] or provider == index:
+                self._providers[field] = provider
+                changed = True
+        return changed
+
+    def compose(self, base: State, states: list[State | None]) -> State:
+        """Return base state with fields replaced by values of their providers."""
+        attributes = dict(base.attributes)
+        for field, companions in self._fields.items():
+            provider = self._providers[field]
+            if provider < 0 or (source := states[provider]) is base:
+                continue
+            for key in (field, *companions):
+                if (value := source.attributes.get(key)) is not None:
+                    attributes[key] = value
+                else:
+                    attributes.pop(key, None)
+        return State(
+            base.entity_id,
+            base.state,
+            attributes,
+            last_changed=base.last_changed,
+            last_reported=base.last_reported,
+            last_updated=base.last_updated,
+            validate_entity_id=False,
+        )
@@ -0,0 +1,101 @@
+#  Copyright (c) 2024, Andrey "Limych" Khrolenok <andrey@khrolenok.ru>
+#  Creative Commons BY-NC-SA 4.0 International Public License
+#  (see LICENSE.md or https://creativecommons.org/licenses/by-nc-sa/4.0/)
+"""Failover metrics for backup_source."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Any
+
+# Number of recent latency samples kept to estimate percentiles
+LATENCY_WINDOW = 1024
+
+
+def percentile(samples: list[float], fraction: float) -> float | None:
+    """Return percentile of sorted samples using the nearest-rank method."""
+    if not samples:
+        return None
+    rank = max(0, min(len(samples) - 1, int(fraction * len(samples) + 0.5) - 1))
+    return samples[rank]
+
+
+class FailoverMetrics:
+    """
+    Lightweight in-memory metrics of a single backup entity.
+
+    Counters are plain integers and latency samples are kept in a bounded
+    window, so recording costs O(1). Percentiles are only computed when
+    metrics are requested.
+    """
+
+    __slots__ = (
+        "_active_since",
+        "_active_time",
+        "_latency",
+        "active_source",
+        "events_ignored",
+        "events_processed",
+        "switches",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.switches = 0
+        self.events_processed = 0
+        self.events_ignored = 0
+        self.active_source: str | None = None
+        self._active_since: float | None = None
+        self._active_time: dict[str, float] = {}
+        self._latency: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def record_event(self, latency: float, *, changed: bool) -> None:
+        """Record handling of one source event."""
+        if changed:
+            self.events_processed += 1
+        else:
+            self.events_ignored += 1
+        self._latency.append(latency)
+
+    def record_selection(self, source: str | None) -> None:
+        """Record source selected as the active one."""
+        if source == self.active_source:
+            return
+
+        now = time.monotonic()
+        if self._active_since is not None:
+            self.switches += 1
+        if (active := self.active_source) is not None:
+            self._active_time[active] = (
+                self._active_time.get(active, 0.0) + now - self._active_since
+            )
+        self.active_source = source
+        self._active_since = now
+
+    def active_time(self) -> dict[str, float]:
+        """Return seconds each source has been active for."""
+        active_time = dict(self._active_time)
+        if (active := self.active_source) is not None:
+            active_time[active] = (
+                active_time.get(active, 0.0) + time.monotonic() - self._active_since
+            )
+        return active_time
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return snapshot of metrics."""
+        samples = sorted(self._latency)
+        p50 = percentile(samples, 0.5)
+        p99 = percentile(samples, 0.99)
+        return {
+            "active_source": self.active_source,
+            "switches": self.switches,
+            "active_time": {
+                source: round(seconds, 3)
+                for source, seconds in self.active_time().items()
+            },
+            "events_processed": self.events_processed,
+            "events_ignored": self.events_ignored,
+            "latency_p50_ms": None if p50 is None else round(p50 * 1000, 3),
+            "latency_p99_ms": None if p99 is None else round(p99 * 1000, 3),
+        }
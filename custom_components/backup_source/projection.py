@@ -0,0 +1,70 @@
+#  Copyright (c) 2024, Andrey "Limych" Khrolenok <andrey@khrolenok.ru>
+#  Creative Commons BY-NC-SA 4.0 International Public License
+#  (see LICENSE.md or https://creativecommons.org/licenses/by-nc-sa/4.0/)
+"""Projections of exposed state attributes for backup_source."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from homeassistant.const import (
+    ATTR_ASSUMED_STATE,
+    ATTR_ATTRIBUTION,
+    ATTR_DEVICE_CLASS,
+    ATTR_ENTITY_PICTURE,
+    ATTR_ICON,
+    ATTR_SUPPORTED_FEATURES,
+    ATTR_UNIT_OF_MEASUREMENT,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from homeassistant.core import State
+
+
+class Projection:
+    """
+    Attributes of a state read by entity properties.
+
+    Subclasses map their slots to attribute keys in FIELDS. Values are read
+    from the state once when it is exposed, so every property read on state
+    write is a slot access instead of a lookup in the attributes mapping.
+    """
+
+    __slots__ = ("state",)
+
+    FIELDS: ClassVar[dict[str, str]] = {}
+
+    def __init__(self, state: State) -> None:
+        """Project attributes of state."""
+        self.state = state
+        get = state.attributes.get
+        for slot, key in self.FIELDS.items():
+            setattr(self, slot, get(key))
+
+    def values(self) -> tuple[Any, ...]:
+        """Return projected values in order of FIELDS."""
+        return tuple(getattr(self, slot) for slot in self.FIELDS)
+
+
+class EntityProjection(Projection):
+    """Attributes of a state read by properties common to all entities."""
+
+    FIELDS: ClassVar[dict[str, str]] = {
+        "assumed_state": ATTR_ASSUMED_STATE,
+        "attribution": ATTR_ATTRIBUTION,
+        "device_class": ATTR_DEVICE_CLASS,
+        "entity_picture": ATTR_ENTITY_PICTURE,
+        "icon": ATTR_ICON,
+        "supported_features": ATTR_SUPPORTED_FEATURES,
+        "unit_of_measurement": ATTR_UNIT_OF_MEASUREMENT,
+    }
+
+    __slots__ = tuple(FIELDS)
+
+    assumed_state: Any
+    attribution: str | None
+    device_class: str | None
+    entity_picture: str | None
+    icon: str | None
+    supported_features: int | None
+    unit_of_measurement: str | None
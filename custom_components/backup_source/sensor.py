@@ -5,14 +5,15 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 from homeassistant.components.sensor import (
     ATTR_LAST_RESET,
+    ATTR_STATE_CLASS,
     PLATFORM_SCHEMA,
     SensorEntity,
 )
-from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.const import CONF_ENTITIES
 
 if TYPE_CHECKING:  # pragma: no cover
     from datetime import date, datetime
@@ -22,25 +23,63 @@ if TYPE_CHECKING:  # pragma: no cover
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
     from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType, StateType
 
-from . import BackupSourceEntity
-from .const import COMMON_BACKUP_SCHEMA
+from . import BackupSourceConfigEntry, BackupSourceEntity, entry_config
+from .const import COMMON_BACKUP_SCHEMA, SENSOR_BACKUP_SCHEMA
+from .projection import EntityProjection
 
-PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(COMMON_BACKUP_SCHEMA)
+PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(COMMON_BACKUP_SCHEMA).extend(
+    SENSOR_BACKUP_SCHEMA
+)
 
 
 async def async_setup_platform(
     hass: HomeAssistant,
     config: ConfigType,
     async_add_entities: AddEntitiesCallback,
-    discovery_info: DiscoveryInfoType | None = None,  # noqa: ARG001
+    discovery_info: DiscoveryInfoType | None = None,
 ) -> None:
     """Set up the backup sensor."""
+    if discovery_info is not None:
+        async_add_entities(
+            BackupSourceSensor(hass, entity_config)
+            for entity_config in discovery_info[CONF_ENTITIES]
+        )
+        return
+
     async_add_entities([BackupSourceSensor(hass, config)])
 
 
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: BackupSourceConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the backup sensor from a config entry."""
+    entity = BackupSourceSensor(hass, entry_config(entry, PLATFORM_SCHEMA))
+    entry.runtime_data = entity
+    async_add_entities([entity])
+
+
+class SensorProjection(EntityProjection):
+    """Attributes of a state read by sensor properties."""
+
+    FIELDS: ClassVar[dict[str, str]] = {
+        **EntityProjection.FIELDS,
+        "last_reset": ATTR_LAST_RESET,
+        "state_class": ATTR_STATE_CLASS,
+    }
+
+    __slots__ = ("last_reset", "state_class")
+
+    last_reset: datetime | None
+    state_class: str | None
+
+
 class BackupSourceSensor(BackupSourceEntity, SensorEntity):
     """Backup Source Sensor class."""
 
+    _projection_class = SensorProjection
+
     @property
     def native_value(self) -> StateType | date | datetime | Decimal:
         """Return the value reported by the sensor."""
@@ -49,9 +88,14 @@ class BackupSourceSensor(BackupSourceEntity, SensorEntity):
     @property
     def native_unit_of_measurement(self) -> str | None:
         """Return the unit of measurement of the sensor, if any."""
-        return self._state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        return self._fields.unit_of_measurement
 
     @property
     def last_reset(self) -> datetime | None:
         """Return the time when the sensor was last reset, if any."""
-        return self._state.attributes.get(ATTR_LAST_RESET)
+        return self._fields.last_reset
+
+    @property
+    def state_class(self) -> str | None:
+        """Return the state class of the sensor, if any."""
+        return self._fields.state_class
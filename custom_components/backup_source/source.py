@@ -0,0 +1,71 @@
+#  Copyright (c) 2024, Andrey "Limych" Khrolenok <andrey@khrolenok.ru>
+#  Creative Commons BY-NC-SA 4.0 International Public License
+#  (see LICENSE.md or https://creativecommons.org/licenses/by-nc-sa/4.0/)
+"""Options and states of single sources for backup_source."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+
+if TYPE_CHECKING:  # pragma: no cover
+    from homeassistant.core import State
+
+    from .validity import Validity
+
+
+def has_value(state: State) -> bool:
+    """Return True if state has any value."""
+    return state.state is not None and state.state not in [
+        STATE_UNKNOWN,
+        STATE_UNAVAILABLE,
+        "None",
+        "",
+    ]
+
+
+class SourceRecord:
+    """
+    Options of a single source resolved against options of the entity.
+
+    Records are built once when sources are configured and are kept in a
+    list parallel to sources, so the selection loop reads options of a
+    source by its index instead of looking them up in the configuration.
+    """
+
+    __slots__ = (
+        "max_age",
+        "offset",
+        "priority",
+        "scale",
+        "skip_no_value",
+        "tier",
+        "transforms",
+        "validity",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        tier: int,
+        priority: int = 0,
+        max_age: float = 0.0,
+        scale: float | None = None,
+        offset: float | None = None,
+        skip_no_value: bool = True,
+        validity: Validity | None = None,
+    ) -> None:
+        """Initialize the record."""
+        self.tier = tier
+        self.priority = priority
+        self.max_age = max_age
+        self.scale = 1.0 if scale is None else scale
+        self.offset = 0.0 if offset is None else offset
+        self.transforms = scale is not None or offset is not None
+        self.skip_no_value = skip_no_value
+        self.validity = validity
+
+    def transform(self, value: float) -> float:
+        """Return numeric value of source rescaled by the record."""
+        return value * self.scale + self.offset
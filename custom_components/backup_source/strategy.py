@@ -0,0 +1,108 @@
+#  Copyright (c) 2024, Andrey "Limych" Khrolenok <andrey@khrolenok.ru>
+#  Creative Commons BY-NC-SA 4.0 International Public License
+#  (see LICENSE.md or https://creativecommons.org/licenses/by-nc-sa/4.0/)
+"""Selection strategies for backup_source."""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, bisect_right, insort
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterable
+
+    from homeassistant.core import State
+
+
+def as_float(state: State | None) -> float | None:
+    """Return numeric value of state or None if it is not a finite number."""
+    if state is None:
+        return None
+    try:
+        value = float(state.state)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+class SourceValues:
+    """
+    Numeric values of sources kept sorted for incremental aggregation.
+
+    An update of one source costs O(log n) to find its place plus a list
+    shift, so aggregates never need to rescan states of all sources.
+    """
+
+    __slots__ = ("_sorted", "_values")
+
+    def __init__(self) -> None:
+        """Initialize the values."""
+        self._values: list[float | None] = []
+        self._sorted: list[float] = []
+
+    def __len__(self) -> int:
+        """Return number of sources which have a numeric value."""
+        return len(self._sorted)
+
+    def reset(self, values: Iterable[float | None]) -> None:
+        """Rebuild values of all sources."""
+        self._values = list(values)
+        self._sorted = sorted(x for x in self._values if x is not None)
+
+    def update(self, index: int, value: float | None) -> bool:
+        """Update value of one source; return True if it has changed."""
+        old = self._values[index]
+        if old == value:
+            return False
+
+        if old is not None:
+            del self._sorted[bisect_left(self._sorted, old)]
+        if value is not None:
+            insort(self._sorted, value)
+        self._values[index] = value
+        return True
+
+    def median(self) -> float | None:
+        """Return median of values."""
+        values = self._sorted
+        if not values:
+            return None
+        middle = len(values) // 2
+        if len(values) % 2:
+            return values[middle]
+        return (values[middle - 1] + values[middle]) / 2
+
+    def _around_median(self, tolerance: float) -> list[float]:
+        """Return values which differ from median by tolerance at most."""
+        median = self.median()
+        if median is None:
+            return []
+        values = self._sorted
+        return values[
+            bisect_left(values, median - tolerance) : bisect_right(
+                values, median + tolerance
+            )
+        ]
+
+    def mean(self, tolerance: float | None = None) -> float | None:
+        """
+        Return arithmetic mean of values.
+
+        If tolerance is set, values farther than tolerance from median are
+        rejected as outliers.
+        """
+        values = self._sorted if tolerance is None else self._around_median(tolerance)
+        if not values:
+            return None
+        return math.fsum(values) / len(values)
+
+    def quorum(self, count: int, tolerance: float = 0.0) -> float | None:
+        """
+        Return median of values if at least count values agree with it.
+
+        Values agree with median if they differ from it by tolerance at most.
+        """
+        if len(self._around_median(tolerance)) < count:
+            return None
+        return self.median()
@@ -0,0 +1,153 @@
+#  Copyright (c) 2024, Andrey "Limych" Khrolenok <andrey@khrolenok.ru>
+#  Creative Commons BY-NC-SA 4.0 International Public License
+#  (see LICENSE.md or https://creativecommons.org/licenses/by-nc-sa/4.0/)
+"""Shared timer queue for backup_source."""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+from typing import TYPE_CHECKING
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:  # pragma: no cover
+    import asyncio
+    from collections.abc import Callable
+
+from .const import DATA_TIMER_QUEUE, DOMAIN
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+# Don't bother to compact heaps smaller than this
+_COMPACT_THRESHOLD = 64
+
+
+@callback
+def async_get_timer_queue(hass: HomeAssistant) -> TimerQueue:
+    """Return integration-wide timer queue, creating it if needed."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if (queue := data.get(DATA_TIMER_QUEUE)) is None:
+        queue = data[DATA_TIMER_QUEUE] = TimerQueue(hass)
+    return queue
+
+
+class TimerEntry:
+    """Deadline scheduled in the timer queue."""
+
+    __slots__ = ("action", "when")
+
+    def __init__(self, when: float, action: Callable[[], None]) -> None:
+        """Initialize the entry."""
+        self.when = when
+        self.action: Callable[[], None] | None = action
+
+    def __lt__(self, other: TimerEntry) -> bool:
+        """Order entries by deadline."""
+        return self.when < other.when
+
+    @property
+    def active(self) -> bool:
+        """Return True if entry is neither fired nor cancelled."""
+        return self.action is not None
+
+
+class TimerQueue:
+    """
+    Integration-wide queue of deadlines served by a single loop timer.
+
+    Deadlines are UTC timestamps kept in a heap. Only the earliest one is
+    armed in the event loop. Cancelled entries are marked and dropped lazily,
+    so both scheduling and cancellation cost O(log n) at most.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the queue."""
+        self.hass = hass
+        self._heap: list[TimerEntry] = []
+        self._cancelled = 0
+        self._handle: asyncio.TimerHandle | None = None
+        self._handle_when = math.inf
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_shutdown)
+
+    def __len__(self) -> int:
+        """Return number of scheduled deadlines."""
+        return len(self._heap) - self._cancelled
+
+    @callback
+    def async_schedule(self, when: float, action: Callable[[], None]) -> TimerEntry:
+        """Schedule action to be called at UTC timestamp when."""
+        entry = TimerEntry(when, action)
+        heapq.heappush(self._heap, entry)
+        if when < self._handle_when:
+            self._async_arm(when)
+        return entry
+
+    @callback
+    def async_cancel(self, entry: TimerEntry | None) -> None:
+        """Cancel scheduled entry."""
+        if entry is None or entry.action is None:
+            return
+
+        entry.action = None
+        self._cancelled += 1
+        if (
+            self._cancelled > _COMPACT_THRESHOLD
+            and self._cancelled > len(self._heap) // 2
+        ):
+            self._heap = [x for x in self._heap if x.action is not None]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    @callback
+    def _async_arm(self, when: float) -> None:
+        """Arm loop timer for the earliest deadline."""
+        if self._handle is not None:
+            self._handle.cancel()
+
+        loop = self.hass.loop
+        delay = max(0.0, when - dt_util.utcnow().timestamp())
+        self._handle = loop.call_at(loop.time() + delay, self._async_fire)
+        self._handle_when = when
+
+    @callback
+    def _async_fire(self) -> None:
+        """Call actions of all expired deadlines."""
+        self._handle = None
+        self._handle_when = math.inf
+
+        heap = self._heap
+        now = dt_util.utcnow().timestamp()
+        while heap and heap[0].when <= now:
+            entry = heapq.heappop(heap)
+            if (action := entry.action) is None:
+                self._cancelled -= 1
+                continue
+
+            entry.action = None
+            try:
+                action()
+            except Exception:
+                _LOGGER.exception("Error while calling timer action %s", action)
+
+        while heap and heap[0].action is None:
+            heapq.heappop(heap)
+            self._cancelled -= 1
+        if heap:
+            self._async_arm(heap[0].when)
+
+    @callback
+    def _async_shutdown(self, event: Event) -> None:  # noqa: ARG002
+        """Stop serving deadlines on Home Assistant stop."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._handle_when = math.inf
+        for entry in self._heap:
+            entry.action = None
+        self._heap.clear()
+        self._cancelled = 0
@@ -0,0 +1,58 @@
+#  Copyright (c) 2024, Andrey "Limych" Khrolenok <andrey@khrolenok.ru>
+#  Creative Commons BY-NC-SA 4.0 International Public License
+#  (see LICENSE.md or https://creativecommons.org/licenses/by-nc-sa/4.0/)
+"""Unit normalization for backup_source."""
+
+from __future__ import annotations
+
+import math
+from decimal import Decimal, InvalidOperation
+from typing import TYPE_CHECKING
+
+from homeassistant.components.sensor import UNIT_CONVERTERS
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable
+
+
+def resolve_converter(
+    from_unit: str | None, to_unit: str, device_class: str | None = None
+) -> Callable[[float], float] | None:
+    """
+    Return function converting values from one unit to another.
+
+    Converter of the device class is preferred, so ambiguous units are
+    resolved the same way as Home Assistant does for sensors. Return None if
+    units are not convertible.
+    """
+    if from_unit == to_unit:
+        return lambda value: value
+
+    converters = list(UNIT_CONVERTERS.values())
+    if (preferred := UNIT_CONVERTERS.get(device_class)) is not None:
+        converters.insert(0, preferred)
+    for converter in converters:
+        if from_unit in converter.VALID_UNITS and to_unit in converter.VALID_UNITS:
+            return converter.converter_factory(from_unit, to_unit)
+    return None
+
+
+def decimals(value: str) -> int | None:
+    """Return number of decimal places of a numeric value written as string."""
+    try:
+        exponent = Decimal(value).as_tuple().exponent
+    except InvalidOperation:
+        return None
+    return max(0, -exponent) if isinstance(exponent, int) else None
+
+
+def scaled_precision(precision: int, scale: float) -> int:
+    """
+    Return precision of values multiplied by scale.
+
+    Precision grows when values are scaled down, the same way as Home
+    Assistant adjusts display precision of sensors on unit conversion.
+    """
+    if not scale:
+        return precision
+    return precision + max(0, math.floor(-math.log10(abs(scale)) + 1e-9))
@@ -0,0 +1,110 @@
+#  Copyright (c) 2024, Andrey "Limych" Khrolenok <andrey@khrolenok.ru>
+#  Creative Commons BY-NC-SA 4.0 International Public License
+#  (see LICENSE.md or https://creativecommons.org/licenses/by-nc-sa/4.0/)
+"""Validity rules of source states for backup_source."""
+
+from __future__ import annotations
+
+import logging
+import math
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import (
+    CONF_ATTRIBUTE,
+    CONF_EXCLUDE,
+    CONF_VALUE_TEMPLATE,
+)
+from homeassistant.exceptions import TemplateError
+from homeassistant.helpers.template import result_as_boolean
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable
+
+    from homeassistant.core import HomeAssistant, State
+    from homeassistant.helpers.typing import ConfigType
+
+from .const import CONF_MAX, CONF_MIN, CONF_NUMERIC
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+
+def _as_number(value: Any) -> float | None:
+    """Return value as a finite number or None."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def compile_rule(hass: HomeAssistant, rule: ConfigType) -> Callable[[State], bool]:
+    """Return predicate checking state against a single rule."""
+    attribute: str | None = rule.get(CONF_ATTRIBUTE)
+    excluded = frozenset(rule.get(CONF_EXCLUDE, ()))
+    # Numeric values are excluded by value, so "0.0" matches excluded "0"
+    excluded_numbers = frozenset(
+        number for value in excluded if (number := _as_number(value)) is not None
+    )
+    minimum: float | None = rule.get(CONF_MIN)
+    maximum: float | None = rule.get(CONF_MAX)
+    numeric = bool(rule.get(CONF_NUMERIC)) or minimum is not None or maximum is not None
+    template = rule.get(CONF_VALUE_TEMPLATE)
+    if template is not None:
+        template.hass = hass
+        template.ensure_valid()
+
+    def predicate(state: State) -> bool:
+        value = state.state if attribute is None else state.attributes.get(attribute)
+        if value is None or (excluded and str(value) in excluded):
+            return False
+        number = _as_number(value) if numeric or excluded_numbers else None
+        if number is not None and number in excluded_numbers:
+            return False
+        if numeric and (
+            number is None
+            or (minimum is not None and number < minimum)
+            or (maximum is not None and number > maximum)
+        ):
+            return False
+        if template is None:
+            return True
+        try:
+            return result_as_boolean(
+                template.async_render(
+                    {"state": state, "value": value}, parse_result=False
+                )
+            )
+        except TemplateError as exc:
+            _LOGGER.debug('Unable to check validity of "%s": %s', state.entity_id, exc)
+            return False
+
+    return predicate
+
+
+class Validity:
+    """
+    Validity rules of sources compiled into a predicate.
+
+    Rules are compiled once when the entity is set up, and the result is
+    cached per source state object, so templates are rendered only when
+    a source changes and repeated selection passes cost a dict lookup.
+    The schema allows templates to use the state of the source only, so
+    cached results never go stale.
+    """
+
+    __slots__ = ("_cache", "_predicates")
+
+    def __init__(self, hass: HomeAssistant, rules: list[ConfigType]) -> None:
+        """Compile the rules; a state is valid when it passes all of them."""
+        self._predicates = [compile_rule(hass, rule) for rule in rules]
+        self._cache: dict[str, tuple[State, bool]] = {}
+
+    def __call__(self, state: State) -> bool:
+        """Return True if state of source is valid."""
+        cached = self._cache.get(state.entity_id)
+        if cached is not None and cached[0] is state:
+            return cached[1]
+
+        result = all(predicate(state) for predicate in self._predicates)
+        self._cache[state.entity_id] = (state, result)
+        return result
@@ -5,7 +5,9 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import asyncio
+import logging
+from typing import TYPE_CHECKING, ClassVar, Literal
 
 from homeassistant.components.weather import (
     ATTR_WEATHER_HUMIDITY,
@@ -21,33 +23,179 @@ from homeassistant.components.weather import (
     ATTR_WEATHER_WIND_SPEED,
     ATTR_WEATHER_WIND_SPEED_UNIT,
     PLATFORM_SCHEMA,
+    SERVICE_GET_FORECASTS,
+    Forecast,
     WeatherEntity,
 )
+from homeassistant.components.weather import DOMAIN as WEATHER_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID, CONF_ENTITIES
+from homeassistant.core import HomeAssistant, State, callback
+from homeassistant.exceptions import HomeAssistantError
 
 if TYPE_CHECKING:  # pragma: no cover
-    from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
     from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
-from . import BackupSourceEntity
-from .const import COMMON_BACKUP_SCHEMA
+from . import BackupSourceConfigEntry, BackupSourceEntity, entry_config
+from .const import (
+    COMMON_BACKUP_SCHEMA,
+    CONF_FORECAST_TTL,
+    CONF_MERGE,
+    DEFAULT_FORECAST_TTL,
+    WEATHER_BACKUP_SCHEMA,
+)
+from .merge import FieldMerge
+from .projection import EntityProjection
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(COMMON_BACKUP_SCHEMA).extend(
+    WEATHER_BACKUP_SCHEMA
+)
+
+ForecastType = Literal["daily", "hourly", "twice_daily"]
 
-PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(COMMON_BACKUP_SCHEMA)
+# Fields merged from different sources along with their units
+MERGE_FIELDS = {
+    ATTR_WEATHER_TEMPERATURE: (ATTR_WEATHER_TEMPERATURE_UNIT,),
+    ATTR_WEATHER_PRESSURE: (ATTR_WEATHER_PRESSURE_UNIT,),
+    ATTR_WEATHER_HUMIDITY: (),
+    ATTR_WEATHER_WIND_SPEED: (ATTR_WEATHER_WIND_SPEED_UNIT,),
+    ATTR_WEATHER_WIND_BEARING: (),
+    ATTR_WEATHER_OZONE: (),
+    ATTR_WEATHER_VISIBILITY: (ATTR_WEATHER_VISIBILITY_UNIT,),
+}
 
 
 async def async_setup_platform(
     hass: HomeAssistant,
     config: ConfigType,
     async_add_entities: AddEntitiesCallback,
-    discovery_info: DiscoveryInfoType | None = None,  # noqa: ARG001
+    discovery_info: DiscoveryInfoType | None = None,
 ) -> None:
     """Set up the backup sensor."""
+    if discovery_info is not None:
+        async_add_entities(
+            BackupSourceWeather(hass, entity_config)
+            for entity_config in discovery_info[CONF_ENTITIES]
+        )
+        return
+
     async_add_entities([BackupSourceWeather(hass, config)])
 
 
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: BackupSourceConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the backup weather from a config entry."""
+    entity = BackupSourceWeather(hass, entry_config(entry, PLATFORM_SCHEMA))
+    entry.runtime_data = entity
+    async_add_entities([entity])
+
+
+class WeatherProjection(EntityProjection):
+    """Attributes of a state read by weather properties."""
+
+    FIELDS: ClassVar[dict[str, str]] = {
+        **EntityProjection.FIELDS,
+        "native_temperature": ATTR_WEATHER_TEMPERATURE,
+        "native_temperature_unit": ATTR_WEATHER_TEMPERATURE_UNIT,
+        "native_pressure": ATTR_WEATHER_PRESSURE,
+        "native_pressure_unit": ATTR_WEATHER_PRESSURE_UNIT,
+        "humidity": ATTR_WEATHER_HUMIDITY,
+        "native_wind_speed": ATTR_WEATHER_WIND_SPEED,
+        "native_wind_speed_unit": ATTR_WEATHER_WIND_SPEED_UNIT,
+        "wind_bearing": ATTR_WEATHER_WIND_BEARING,
+        "ozone": ATTR_WEATHER_OZONE,
+        "native_visibility": ATTR_WEATHER_VISIBILITY,
+        "native_visibility_unit": ATTR_WEATHER_VISIBILITY_UNIT,
+        "native_precipitation_unit": ATTR_WEATHER_PRECIPITATION_UNIT,
+    }
+
+    __slots__ = (
+        "humidity",
+        "native_precipitation_unit",
+        "native_pressure",
+        "native_pressure_unit",
+        "native_temperature",
+        "native_temperature_unit",
+        "native_visibility",
+        "native_visibility_unit",
+        "native_wind_speed",
+        "native_wind_speed_unit",
+        "ozone",
+        "wind_bearing",
+    )
+
+    native_temperature: float | None
+    native_temperature_unit: str | None
+    native_pressure: float | None
+    native_pressure_unit: str | None
+    humidity: float | None
+    native_wind_speed: float | None
+    native_wind_speed_unit: str | None
+    wind_bearing: float | str | None
+    ozone: float | None
+    native_visibility: float | None
+    native_visibility_unit: str | None
+    native_precipitation_unit: str | None
+
+
 class BackupSourceWeather(BackupSourceEntity, WeatherEntity):
     """Backup Source Weather class."""
 
+    _projection_class = WeatherProjection
+
+    def __init__(self, hass: HomeAssistant, config: ConfigType) -> None:
+        """Initialize the weather."""
+        super().__init__(hass, config)
+
+        ttl = config.get(CONF_FORECAST_TTL, DEFAULT_FORECAST_TTL)
+        self._forecast_ttl = ttl.total_seconds()
+        self._forecast_source: str | None = None
+        self._forecasts: dict[
+            ForecastType, tuple[str, float, asyncio.Task[list[Forecast] | None]]
+        ] = {}
+
+        # Missing fields of the selected source are filled from other sources
+        self._merge = FieldMerge(MERGE_FIELDS) if config.get(CONF_MERGE) else None
+        self._merge_dirty = False
+        self._merge_base: State | None = None
+        self._merged: State | None = None
+
+    @callback
+    def _async_reset_selection(self) -> None:
+        """Rebuild selection data from cached states of all sources."""
+        super()._async_reset_selection()
+        if self._merge is not None:
+            self._merge.reset(self._source_states, self._engine.mask)
+            self._merge_dirty = True
+
+    @callback
+    def _async_update_source(
+        self, index: int, state: State | None, *, eligible: bool
+    ) -> None:
+        """Update selection data from a new state of a single source."""
+        super()._async_update_source(index, state, eligible=eligible)
+        if self._merge is not None and self._merge.update(
+            index, state, eligible=eligible
+        ):
+            self._merge_dirty = True
+
+    @callback
+    def _async_compose(self, state: State) -> State:
+        """Return selected state with fields merged from other sources."""
+        if self._merge is None:
+            return state
+
+        if self._merge_dirty or state is not self._merge_base:
+            self._merge_base = state
+            self._merged = self._merge.compose(state, self._source_states)
+            self._merge_dirty = False
+        return self._merged
+
     @property
     def condition(self) -> str | None:
         """Return the current condition."""
@@ -56,59 +204,141 @@ class BackupSourceWeather(BackupSourceEntity, WeatherEntity):
     @property
     def native_temperature(self) -> float | None:
         """Return the platform temperature in native units (i.e. not converted)."""
-        return self._state.attributes.get(ATTR_WEATHER_TEMPERATURE)
+        return self._fields.native_temperature
 
     @property
     def native_temperature_unit(self) -> str | None:
         """Return the native unit of measurement for temperature."""
-        return self._state.attributes.get(ATTR_WEATHER_TEMPERATURE_UNIT)
+        return self._fields.native_temperature_unit
 
     @property
     def native_pressure(self) -> float | None:
         """Return the pressure in native units."""
-        return self._state.attributes.get(ATTR_WEATHER_PRESSURE)
+        return self._fields.native_pressure
 
     @property
     def native_pressure_unit(self) -> str | None:
         """Return the native unit of measurement for pressure."""
-        return self._state.attributes.get(ATTR_WEATHER_PRESSURE_UNIT)
+        return self._fields.native_pressure_unit
 
     @property
     def humidity(self) -> float | None:
         """Return the humidity in native units."""
-        return self._state.attributes.get(ATTR_WEATHER_HUMIDITY)
+        return self._fields.humidity
 
     @property
     def native_wind_speed(self) -> float | None:
         """Return the wind speed in native units."""
-        return self._state.attributes.get(ATTR_WEATHER_WIND_SPEED)
+        return self._fields.native_wind_speed
 
     @property
     def native_wind_speed_unit(self) -> str | None:
         """Return the native unit of measurement for wind speed."""
-        return self._state.attributes.get(ATTR_WEATHER_WIND_SPEED_UNIT)
+        return self._fields.native_wind_speed_unit
 
     @property
     def wind_bearing(self) -> float | str | None:
         """Return the wind bearing."""
-        return self._state.attributes.get(ATTR_WEATHER_WIND_BEARING)
+        return self._fields.wind_bearing
 
     @property
     def ozone(self) -> float | None:
         """Return the ozone level."""
-        return self._state.attributes.get(ATTR_WEATHER_OZONE)
+        return self._fields.ozone
 
     @property
     def native_visibility(self) -> float | None:
         """Return the visibility in native units."""
-        return self._state.attributes.get(ATTR_WEATHER_VISIBILITY)
+        return self._fields.native_visibility
 
     @property
     def native_visibility_unit(self) -> str | None:
         """Return the native unit of measurement for visibility."""
-        return self._state.attributes.get(ATTR_WEATHER_VISIBILITY_UNIT)
+        return self._fields.native_visibility_unit
 
     @property
     def native_precipitation_unit(self) -> str | None:
         """Return the native unit of measurement for accumulated precipitation."""
-        return self._state.attributes.get(ATTR_WEATHER_PRECIPITATION_UNIT)
+        return self._fields.native_precipitation_unit
+
+    async def async_forecast_daily(self) -> list[Forecast] | None:
+        """Return the daily forecast in native units."""
+        return await self._async_forecast("daily")
+
+    async def async_forecast_hourly(self) -> list[Forecast] | None:
+        """Return the hourly forecast in native units."""
+        return await self._async_forecast("hourly")
+
+    async def async_forecast_twice_daily(self) -> list[Forecast] | None:
+        """Return the twice daily forecast in native units."""
+        return await self._async_forecast("twice_daily")
+
+    async def _async_forecast(
+        self, forecast_type: ForecastType
+    ) -> list[Forecast] | None:
+        """
+        Return forecast of the selected source.
+
+        Forecasts are cached per type for forecast TTL. Concurrent requests
+        share one call of the source, so a burst of subscriptions costs one
+        service call only.
+        """
+        source = self._state.entity_id
+        now = self.hass.loop.time()
+        entry = self._forecasts.get(forecast_type)
+        if entry is None or entry[0] != source or entry[1] <= now:
+            entry = self._forecasts[forecast_type] = (
+                source,
+                now + self._forecast_ttl,
+                self.hass.async_create_task(
+                    self._async_fetch_forecast(source, forecast_type)
+                ),
+            )
+
+        forecast = await asyncio.shield(entry[2])
+        if forecast is None and self._forecasts.get(forecast_type) is entry:
+            # Don't cache failures
+            del self._forecasts[forecast_type]
+        return forecast
+
+    async def _async_fetch_forecast(
+        self, source: str, forecast_type: ForecastType
+    ) -> list[Forecast] | None:
+        """Call source for its forecast."""
+        try:
+            response = await self.hass.services.async_call(
+                WEATHER_DOMAIN,
+                SERVICE_GET_FORECASTS,
+                {ATTR_ENTITY_ID: source, "type": forecast_type},
+                blocking=True,
+                return_response=True,
+            )
+        except HomeAssistantError as err:
+            _LOGGER.debug('Unable to get forecast from "%s": %s', source, err)
+            return None
+        return response.get(source, {}).get("forecast")
+
+    @callback
+    def _async_publish(self) -> None:
+        """Write entity state and push forecasts to subscribers if needed."""
+        super()._async_publish()
+
+        # Cached forecasts are refreshed only when subscribers ask for them
+        now = self.hass.loop.time()
+        source = self._state.entity_id
+        forecast_types: list[ForecastType] | None = None
+        if source != self._forecast_source:
+            self._forecast_source = source
+            self._forecasts.clear()
+        else:
+            # Expired forecasts are dropped, so each of them is refreshed once
+            forecast_types = [
+                forecast_type
+                for forecast_type, (_, expires, _) in self._forecasts.items()
+                if expires <= now
+            ]
+            if not forecast_types:
+                return
+            for forecast_type in forecast_types:
+                del self._forecasts[forecast_type]
+        self.hass.async_create_task(self.async_update_listeners(forecast_types))
@@ -23,6 +23,30 @@ import pytest
 pytest_plugins = "pytest_homeassistant_custom_component"  # pylint: disable=invalid-name
 
 
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add command line options."""
+    parser.addoption(
+        "--benchmark", action="store_true", default=False, help="run benchmarks"
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register custom markers."""
+    config.addinivalue_line("markers", "benchmark: performance benchmark")
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skip benchmarks unless they are requested explicitly."""
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="need --benchmark option to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 # This fixture enables loading custom integrations in all tests.
 # Remove to enable selective use of this fixture
 @pytest.fixture(autouse=True)
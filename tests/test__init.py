@@ -1,11 +1,15 @@
 # pylint: disable=protected-access,redefined-outer-name
 """Test backup_source setup process."""
 
+from unittest.mock import patch
+
 import pytest
 from homeassistant.components.sensor import DOMAIN as DOMAIN_SENSOR
 from homeassistant.components.template import DOMAIN as DOMAIN_TEMPLATE
 from homeassistant.components.template.const import CONF_AVAILABILITY_TEMPLATE
 from homeassistant.const import (
+    CONF_EXCLUDE,
+    CONF_INCLUDE,
     CONF_NAME,
     CONF_PLATFORM,
     CONF_SENSORS,
@@ -14,12 +18,13 @@ from homeassistant.const import (
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
 )
-from homeassistant.core import State
+from homeassistant.core import State, StateMachine
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import async_setup_component
 from pytest_homeassistant_custom_component.common import assert_setup_component
 
 from custom_components.backup_source import (
+    CONF_ATTRIBUTES,
     CONF_SKIP_NO_VALUE,
     CONF_SOURCES,
     DOMAIN,
@@ -140,3 +145,71 @@ async def test__async_update(hass, caplog, test_entities, config):
     await entity.async_update()
     assert len(caplog.records) == 2
     assert "Unable to find an entity" in caplog.text
+
+
+async def test__async_source_changed(hass, config):
+    """Test BackupSourceEntity._async_source_changed method."""
+    config[CONF_SOURCES] = ["sensor.test_1", "sensor.test_2", "sensor.test_3"]
+    hass.states.async_set("sensor.test_1", STATE_UNAVAILABLE)
+    hass.states.async_set("sensor.test_2", 2)
+    hass.states.async_set("sensor.test_3", 3)
+    entity = BackupSourceEntity(hass, config)
+    await entity.async_update()
+    assert entity.state == "2"
+
+    with patch.object(
+        StateMachine, "get", autospec=True, side_effect=StateMachine.get
+    ) as states_get:
+        entity._async_source_changed("sensor.test_3", State("sensor.test_3", 33))
+        assert entity.state == "2"
+
+        entity._async_source_changed("sensor.test_2", State("sensor.test_2", 22))
+        assert entity.state == "22"
+
+        entity._async_source_changed("sensor.test_2", None)
+        assert entity.state == "33"
+        assert entity.extra_state_attributes["source"] == "sensor.test_3"
+
+        entity._async_source_changed("sensor.test_1", State("sensor.test_1", 11))
+        assert entity.state == "11"
+
+        entity._async_source_changed("sensor.unknown", State("sensor.unknown", 0))
+        assert entity.state == "11"
+
+    assert states_get.call_count == 0
+
+
+@pytest.mark.parametrize(
+    ("attributes", "expected"),
+    [
+        (None, {"foo": 1, "bar": 2, "baz": 3, "source": "sensor.test_monitored"}),
+        (
+            {CONF_INCLUDE: ["foo", "bar"]},
+            {"foo": 1, "bar": 2, "source": "sensor.test_monitored"},
+        ),
+        (
+            {CONF_EXCLUDE: ["foo"]},
+            {"bar": 2, "baz": 3, "source": "sensor.test_monitored"},
+        ),
+        (
+            {CONF_INCLUDE: ["foo", "bar"], CONF_EXCLUDE: ["foo"]},
+            {"bar": 2, "source": "sensor.test_monitored"},
+        ),
+    ],
+)
+async def test_extra_state_attributes(hass, config, attributes, expected):
+    """Test BackupSourceEntity.extra_state_attributes property."""
+    if attributes is not None:
+        config[CONF_ATTRIBUTES] = attributes
+    hass.states.async_set("sensor.test_monitored", 1, {"foo": 1, "bar": 2, "baz": 3})
+    entity = BackupSourceEntity(hass, config)
+    await entity.async_update()
+
+    assert entity.extra_state_attributes == expected
+    assert entity.extra_state_attributes is entity.extra_state_attributes
+
+    cached = entity.extra_state_attributes
+    entity._async_source_changed(
+        "sensor.test_monitored", State("sensor.test_monitored", 2, {"foo": 0})
+    )
+    assert entity.extra_state_attributes is not cached
@@ -0,0 +1,193 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""
+Benchmarks of backup_source failover hot path.
+
+Benchmarks are skipped by default. Run them with:
+
+    pytest tests/test_benchmark.py --benchmark --no-cov -s
+"""
+
+from __future__ import annotations
+
+import random
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.components.sensor import DOMAIN as DOMAIN_SENSOR
+from homeassistant.const import (
+    CONF_NAME,
+    CONF_PLATFORM,
+    EVENT_STATE_CHANGED,
+    STATE_UNAVAILABLE,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import assert_setup_component
+
+from custom_components.backup_source import CONF_SOURCES, DOMAIN
+from custom_components.backup_source.metrics import percentile
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+pytestmark = pytest.mark.benchmark
+
+# Number of synthetic source events replayed by each benchmark
+EVENTS = 5000
+
+Replay = list[tuple[str, str]]
+
+
+def _source_id(entity: int, source: int) -> str:
+    """Return entity_id of a synthetic source."""
+    return f"sensor.src_{entity}_{source}"
+
+
+def _stream(entities: int, sources: int, rnd: random.Random) -> Replay:
+    """Return random value updates of random sources."""
+    return [
+        (
+            _source_id(rnd.randrange(entities), rnd.randrange(sources)),
+            str(rnd.randint(0, 1000)),
+        )
+        for _ in range(EVENTS)
+    ]
+
+
+def _flaps(entities: int, sources: int, rnd: random.Random) -> Replay:
+    """Return primary sources repeatedly going unavailable and back."""
+    replay: Replay = []
+    while len(replay) < EVENTS:
+        entity_id = _source_id(rnd.randrange(entities), 0)
+        replay.append((entity_id, STATE_UNAVAILABLE))
+        replay.append((entity_id, str(rnd.randint(0, 1000))))
+    return replay[:EVENTS]
+
+
+def _storm(entities: int, sources: int, rnd: random.Random) -> Replay:
+    """Return all sources going unavailable at once and coming back."""
+    replay: Replay = []
+    while len(replay) < EVENTS:
+        all_sources = [
+            _source_id(entity, source)
+            for entity in range(entities)
+            for source in range(sources)
+        ]
+        replay.extend((entity_id, STATE_UNAVAILABLE) for entity_id in all_sources)
+        replay.extend(
+            (entity_id, str(rnd.randint(0, 1000))) for entity_id in all_sources
+        )
+    return replay[:EVENTS]
+
+
+async def _async_setup_entities(
+    hass: HomeAssistant, entities: int, sources: int
+) -> None:
+    """Set up backup entities with their synthetic sources."""
+    config = {DOMAIN_SENSOR: []}
+    for entity in range(entities):
+        for source in range(sources):
+            hass.states.async_set(_source_id(entity, source), source)
+        config[DOMAIN_SENSOR].append(
+            {
+                CONF_PLATFORM: DOMAIN,
+                CONF_NAME: f"backup_{entity}",
+                CONF_SOURCES: [_source_id(entity, source) for source in range(sources)],
+            }
+        )
+
+    with assert_setup_component(entities, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+
+
+async def _async_replay(hass: HomeAssistant, replay: Replay) -> dict[str, float]:
+    """Replay source events and return measured figures."""
+    writes = 0
+
+    @callback
+    def async_filter(event_data: dict) -> bool:
+        return event_data["entity_id"].startswith("sensor.backup_")
+
+    @callback
+    def async_count(event) -> None:
+        nonlocal writes
+        writes += 1
+
+    unsub = hass.bus.async_listen(
+        EVENT_STATE_CHANGED, async_count, event_filter=async_filter
+    )
+
+    # Listeners run inline, so the duration of each state write is the time
+    # the event loop is blocked by handling of one source event
+    async_set = hass.states.async_set
+    stalls = []
+    start = time.perf_counter()
+    for entity_id, state in replay:
+        event_start = time.perf_counter()
+        async_set(entity_id, state)
+        stalls.append(time.perf_counter() - event_start)
+    await hass.async_block_till_done()
+    elapsed = time.perf_counter() - start
+    unsub()
+
+    stalls.sort()
+    return {
+        "events_per_second": len(replay) / elapsed,
+        "writes_per_event": writes / len(replay),
+        "stall_p50_us": percentile(stalls, 0.5) * 1e6,
+        "stall_p99_us": percentile(stalls, 0.99) * 1e6,
+    }
+
+
+def _allocations(hass: HomeAssistant, replay: Replay) -> float:
+    """Return mean peak of memory allocated while handling one event."""
+    async_set = hass.states.async_set
+    total = 0
+    tracemalloc.start()
+    try:
+        for entity_id, state in replay:
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            async_set(entity_id, state)
+            total += tracemalloc.get_traced_memory()[1] - current
+    finally:
+        tracemalloc.stop()
+    return total / len(replay)
+
+
+@pytest.mark.parametrize(
+    ("entities", "sources"),
+    [
+        (10, 5),
+        (100, 10),
+    ],
+)
+@pytest.mark.parametrize("scenario", [_stream, _flaps, _storm])
+async def test_benchmark(
+    hass: HomeAssistant,
+    capsys: pytest.CaptureFixture[str],
+    entities: int,
+    sources: int,
+    scenario: Callable[[int, int, random.Random], Replay],
+) -> None:
+    """Benchmark handling of a synthetic stream of source events."""
+    await _async_setup_entities(hass, entities, sources)
+
+    rnd = random.Random(entities * sources)
+    figures = await _async_replay(hass, scenario(entities, sources, rnd))
+    figures["alloc_bytes_per_event"] = _allocations(
+        hass, scenario(entities, sources, rnd)
+    )
+    await hass.async_block_till_done()
+
+    with capsys.disabled():
+        print(  # noqa: T201
+            f"\n{scenario.__name__[1:]:>6} {entities:>4}x{sources:<3}",
+            ", ".join(f"{key}={value:.2f}" for key, value in figures.items()),
+        )
+
+    # Each source belongs to one backup entity, so it can cause one write only
+    assert figures["writes_per_event"] <= 1
@@ -1,6 +1,7 @@
 # pylint: disable=protected-access,redefined-outer-name
 """Test backup_source binary_sensor setup process."""
 
+from datetime import timedelta
 from unittest.mock import MagicMock
 
 import pytest
@@ -12,16 +13,32 @@ from homeassistant.const import (
     CONF_SENSORS,
     CONF_UNIQUE_ID,
     CONF_VALUE_TEMPLATE,
+    STATE_OFF,
+    STATE_ON,
+    STATE_UNAVAILABLE,
 )
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import async_setup_component
-from pytest_homeassistant_custom_component.common import assert_setup_component
+from pytest_homeassistant_custom_component.common import (
+    assert_setup_component,
+    async_fire_time_changed,
+)
 
 from custom_components.backup_source import CONF_SKIP_NO_VALUE, CONF_SOURCES, DOMAIN
 from custom_components.backup_source.binary_sensor import (
     BackupSourceBinarySensor,
     async_setup_platform,
 )
+from custom_components.backup_source.const import (
+    ATTR_SOURCE,
+    CONF_DELAY_OFF,
+    CONF_DELAY_ON,
+    CONF_QUORUM,
+    CONF_VOTE,
+    VOTE_ALL,
+    VOTE_ANY,
+    VOTE_QUORUM,
+)
 
 
 @pytest.fixture(name="test_entities")
@@ -71,3 +88,112 @@ async def test_binary_sensor(hass, caplog, test_entities, config):
     assert len(caplog.records) == 1
     assert "Processing entity" in caplog.text
     assert entity.is_on
+
+
+@pytest.mark.parametrize(
+    ("vote", "states", "expected"),
+    [
+        (VOTE_ANY, [STATE_OFF, STATE_OFF, STATE_OFF], STATE_OFF),
+        (VOTE_ANY, [STATE_OFF, STATE_ON, STATE_UNAVAILABLE], STATE_ON),
+        (VOTE_ALL, [STATE_ON, STATE_ON, STATE_UNAVAILABLE], STATE_ON),
+        (VOTE_ALL, [STATE_ON, STATE_OFF, STATE_ON], STATE_OFF),
+        (VOTE_QUORUM, [STATE_ON, STATE_OFF, STATE_OFF], STATE_OFF),
+        (VOTE_QUORUM, [STATE_OFF, STATE_ON, STATE_ON], STATE_ON),
+        (VOTE_QUORUM, [STATE_UNAVAILABLE] * 3, STATE_UNAVAILABLE),
+    ],
+)
+async def test_binary_sensor_vote(hass, vote, states, expected):
+    """Test voting of sources."""
+    for index in range(3):
+        hass.states.async_set(f"binary_sensor.test_{index}", STATE_OFF)
+    config = {
+        DOMAIN_BINARY_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: [f"binary_sensor.test_{index}" for index in range(3)],
+            CONF_VOTE: vote,
+            CONF_QUORUM: 2,
+        },
+    }
+    with assert_setup_component(1, DOMAIN_BINARY_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_BINARY_SENSOR, config)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.test").state == STATE_OFF
+
+    for index, state in enumerate(states):
+        hass.states.async_set(f"binary_sensor.test_{index}", state)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test")
+    assert state.state == expected
+    if expected != STATE_UNAVAILABLE:
+        assert state.attributes[ATTR_SOURCE] == next(
+            f"binary_sensor.test_{index}"
+            for index, value in enumerate(states)
+            if value != STATE_UNAVAILABLE
+        )
+
+
+async def test_binary_sensor_delays(hass, freezer):
+    """Test changes of result are published after their delays."""
+    hass.states.async_set("binary_sensor.test_1", STATE_OFF)
+    hass.states.async_set("binary_sensor.test_2", STATE_OFF)
+    config = {
+        DOMAIN_BINARY_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["binary_sensor.test_1", "binary_sensor.test_2"],
+            CONF_VOTE: VOTE_ANY,
+            CONF_DELAY_ON: {"seconds": 10},
+            CONF_DELAY_OFF: {"seconds": 30},
+        },
+    }
+    with assert_setup_component(1, DOMAIN_BINARY_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_BINARY_SENSOR, config)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.test").state == STATE_OFF
+
+    # Short blip is suppressed
+    hass.states.async_set("binary_sensor.test_2", STATE_ON)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.test").state == STATE_OFF
+    freezer.tick(timedelta(seconds=5))
+    async_fire_time_changed(hass)
+    hass.states.async_set("binary_sensor.test_2", STATE_OFF)
+    await hass.async_block_till_done()
+    freezer.tick(timedelta(seconds=10))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.test").state == STATE_OFF
+
+    # Lasting change is published after its delay
+    hass.states.async_set("binary_sensor.test_1", STATE_ON)
+    await hass.async_block_till_done()
+    freezer.tick(timedelta(seconds=11))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.test").state == STATE_ON
+
+    hass.states.async_set("binary_sensor.test_1", STATE_OFF)
+    await hass.async_block_till_done()
+    freezer.tick(timedelta(seconds=11))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.test").state == STATE_ON
+    freezer.tick(timedelta(seconds=20))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.test").state == STATE_OFF
+
+    # Result after an outage of all sources is delayed too
+    hass.states.async_set("binary_sensor.test_1", STATE_UNAVAILABLE)
+    hass.states.async_set("binary_sensor.test_2", STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.test").state == STATE_UNAVAILABLE
+    hass.states.async_set("binary_sensor.test_1", STATE_ON)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.test").state == STATE_OFF
+    freezer.tick(timedelta(seconds=11))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.test").state == STATE_ON
@@ -0,0 +1,152 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""Test backup_source bulk definitions."""
+
+from unittest.mock import patch
+
+import pytest
+from homeassistant.components.sensor import DOMAIN as DOMAIN_SENSOR
+from homeassistant.const import CONF_NAME, CONF_UNIQUE_ID, SERVICE_RELOAD
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+
+from custom_components.backup_source.bulk import RuleExpander
+from custom_components.backup_source.const import (
+    ATTR_SOURCE,
+    CONF_FOR_EACH,
+    CONF_SOURCES,
+    DOMAIN,
+    FOR_EACH_AREA,
+)
+
+
+@pytest.fixture(name="entities")
+def entities_fixture(hass: HomeAssistant) -> None:
+    """Register test sources in areas."""
+    areas = ar.async_get(hass)
+    registry = er.async_get(hass)
+    for area_name, object_ids in (
+        ("Kitchen", ["kitchen_temperature", "kitchen_temperature_main"]),
+        ("Bedroom", ["bedroom_temperature"]),
+    ):
+        area = areas.async_create(area_name)
+        for object_id in object_ids:
+            entry = registry.async_get_or_create(
+                DOMAIN_SENSOR, "test", object_id, suggested_object_id=object_id
+            )
+            registry.async_update_entity(entry.entity_id, area_id=area.id)
+    registry.async_get_or_create(
+        DOMAIN_SENSOR, DOMAIN, "backup", suggested_object_id="backup_temperature"
+    )
+
+    hass.states.async_set("sensor.kitchen_temperature", 21)
+    hass.states.async_set("sensor.kitchen_temperature_main", 22)
+    hass.states.async_set("sensor.bedroom_temperature", 19)
+    hass.states.async_set("sensor.hall_temperature", 20)
+    hass.states.async_set("sensor.outdoor", 5)
+
+
+async def test_expand(hass: HomeAssistant, entities: None) -> None:
+    """Test expansion of rules into configs of entities."""
+    expander = RuleExpander(hass)
+
+    assert expander.expand(
+        {
+            CONF_NAME: "Temperature",
+            CONF_SOURCES: [
+                "sensor.*_temperature_main",
+                ["sensor.kitchen_*", "sensor.hall_*"],
+                "sensor.outdoor",
+            ],
+        }
+    ) == [
+        {
+            CONF_NAME: "Temperature",
+            CONF_SOURCES: [
+                "sensor.kitchen_temperature_main",
+                ["sensor.kitchen_temperature", "sensor.hall_temperature"],
+                "sensor.outdoor",
+            ],
+        }
+    ]
+
+    # Backup entities are never matched
+    assert expander.expand(
+        {CONF_NAME: "All", CONF_SOURCES: ["sensor.*_temperature"]}
+    ) == [
+        {
+            CONF_NAME: "All",
+            CONF_SOURCES: [
+                "sensor.bedroom_temperature",
+                "sensor.hall_temperature",
+                "sensor.kitchen_temperature",
+            ],
+        }
+    ]
+
+    assert expander.expand(
+        {
+            CONF_NAME: "{area} temperature",
+            CONF_UNIQUE_ID: "temperature",
+            CONF_SOURCES: [
+                "sensor.*_temperature_main",
+                "sensor.*_temperature",
+                "sensor.outdoor",
+            ],
+            CONF_FOR_EACH: FOR_EACH_AREA,
+        }
+    ) == [
+        {
+            CONF_NAME: "Bedroom temperature",
+            CONF_UNIQUE_ID: "temperature_bedroom",
+            CONF_SOURCES: ["sensor.bedroom_temperature", "sensor.outdoor"],
+        },
+        {
+            CONF_NAME: "Kitchen temperature",
+            CONF_UNIQUE_ID: "temperature_kitchen",
+            CONF_SOURCES: [
+                "sensor.kitchen_temperature_main",
+                "sensor.kitchen_temperature",
+                "sensor.outdoor",
+            ],
+        },
+    ]
+
+    assert expander.expand({CONF_NAME: "None", CONF_SOURCES: ["sensor.none_*"]}) == []
+
+
+async def test_bulk_entities(hass: HomeAssistant, entities: None) -> None:
+    """Test backup entities are created from bulk rules and reloaded."""
+    config = {
+        DOMAIN: {
+            DOMAIN_SENSOR: [
+                {
+                    CONF_NAME: "temperature",
+                    CONF_SOURCES: ["sensor.*_temperature_main", "sensor.*_temperature"],
+                    CONF_FOR_EACH: FOR_EACH_AREA,
+                },
+            ],
+        },
+    }
+    assert await async_setup_component(hass, DOMAIN, config)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.kitchen_temperature_2")
+    assert state.state == "22"
+    assert state.attributes[ATTR_SOURCE] == "sensor.kitchen_temperature_main"
+    state = hass.states.get("sensor.bedroom_temperature_2")
+    assert state.state == "19"
+    assert state.attributes[ATTR_SOURCE] == "sensor.bedroom_temperature"
+
+    config[DOMAIN][DOMAIN_SENSOR][0][CONF_SOURCES] = ["sensor.*_temperature"]
+    with patch(
+        "homeassistant.config.load_yaml_config_file", autospec=True, return_value=config
+    ):
+        await hass.services.async_call(DOMAIN, SERVICE_RELOAD, {}, blocking=True)
+        await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.kitchen_temperature_2")
+    assert state.state == "21"
+    assert state.attributes[ATTR_SOURCE] == "sensor.kitchen_temperature"
+    assert hass.states.get("sensor.bedroom_temperature_2").state == "19"
@@ -0,0 +1,115 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""Test backup_source config flow."""
+
+from homeassistant.components.sensor import DOMAIN as DOMAIN_SENSOR
+from homeassistant.config_entries import SOURCE_USER, ConfigEntryState
+from homeassistant.const import CONF_NAME, CONF_PLATFORM
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.backup_source.const import (
+    ATTR_SOURCE,
+    CONF_SKIP_NO_VALUE,
+    CONF_SOURCES,
+    DOMAIN,
+)
+
+
+async def test_user_flow(hass: HomeAssistant) -> None:
+    """Test creation of an entry by user."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "user"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_NAME: "Backup", CONF_PLATFORM: DOMAIN_SENSOR}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "sources"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_SOURCES: [], CONF_SKIP_NO_VALUE: True}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {CONF_SOURCES: "no_sources"}
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_SOURCES: ["sensor.test_1", "sensor.test_2"], CONF_SKIP_NO_VALUE: True},
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["title"] == "Backup"
+    assert result["data"] == {CONF_PLATFORM: DOMAIN_SENSOR}
+    assert result["options"] == {
+        CONF_SOURCES: ["sensor.test_1", "sensor.test_2"],
+        CONF_SKIP_NO_VALUE: True,
+    }
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.backup")
+    assert state is not None
+
+
+async def test_options_flow(hass: HomeAssistant) -> None:
+    """Test changing of sources is applied to the live entity in place."""
+    hass.states.async_set("sensor.test_1", 1)
+    hass.states.async_set("sensor.test_2", 2)
+    hass.states.async_set("sensor.test_3", 3)
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Backup",
+        data={CONF_PLATFORM: DOMAIN_SENSOR},
+        options={
+            CONF_SOURCES: ["sensor.test_1", "sensor.test_2"],
+            CONF_SKIP_NO_VALUE: True,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.backup")
+    assert state.state == "1"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_1"
+    entity = entry.runtime_data
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_SOURCES: [], CONF_SKIP_NO_VALUE: True}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {CONF_SOURCES: "no_sources"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {CONF_SOURCES: ["sensor.test_3", "sensor.test_1"], CONF_SKIP_NO_VALUE: True},
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+
+    # Entity is not reloaded, but switched to the new primary source
+    assert entry.state is ConfigEntryState.LOADED
+    assert entry.runtime_data is entity
+    assert entity.sources == ["sensor.test_3", "sensor.test_1"]
+    state = hass.states.get("sensor.backup")
+    assert state.state == "3"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_3"
+
+    # Removed source is not tracked anymore
+    hass.states.async_set("sensor.test_3", "unavailable")
+    hass.states.async_set("sensor.test_2", 22)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.backup")
+    assert state.state == "1"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_1"
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.NOT_LOADED
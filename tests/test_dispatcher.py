@@ -0,0 +1,90 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""Test backup_source state change dispatcher."""
+
+from unittest.mock import MagicMock
+
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_STATE_REPORTED
+from homeassistant.core import callback
+
+from custom_components.backup_source.const import DATA_DISPATCHER, DOMAIN
+from custom_components.backup_source.dispatcher import (
+    SourceDispatcher,
+    async_get_dispatcher,
+)
+
+
+async def test_async_get_dispatcher(hass):
+    """Test async_get_dispatcher function."""
+    dispatcher = async_get_dispatcher(hass)
+
+    assert isinstance(dispatcher, SourceDispatcher)
+    assert hass.data[DOMAIN][DATA_DISPATCHER] is dispatcher
+    assert async_get_dispatcher(hass) is dispatcher
+
+
+async def test_dispatch(hass):
+    """Test routing of state changes to listeners."""
+    listeners_count = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+    dispatcher = async_get_dispatcher(hass)
+    listener_1 = callback(MagicMock())
+    listener_2 = callback(MagicMock())
+
+    unsub_1 = dispatcher.async_subscribe(["sensor.test_1", "sensor.test_2"], listener_1)
+    unsub_2 = dispatcher.async_subscribe(["sensor.test_2", "sensor.test_3"], listener_2)
+    assert dispatcher.entity_ids == {"sensor.test_1", "sensor.test_2", "sensor.test_3"}
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners_count + 1
+
+    hass.states.async_set("sensor.test_1", 1)
+    hass.states.async_set("sensor.test_2", 2)
+    hass.states.async_set("sensor.test_4", 4)
+    await hass.async_block_till_done()
+
+    assert listener_1.call_count == 2
+    assert listener_2.call_count == 1
+    assert listener_2.call_args[0][0].data["entity_id"] == "sensor.test_2"
+
+    unsub_1()
+    assert dispatcher.entity_ids == {"sensor.test_2", "sensor.test_3"}
+
+    hass.states.async_set("sensor.test_2", 22)
+    await hass.async_block_till_done()
+
+    assert listener_1.call_count == 2
+    assert listener_2.call_count == 2
+
+    unsub_2()
+    assert dispatcher.entity_ids == set()
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners_count
+
+
+async def test_dispatch_error(hass, caplog):
+    """Test errors in listeners do not break dispatching."""
+    dispatcher = async_get_dispatcher(hass)
+    listener_1 = callback(MagicMock(side_effect=ValueError))
+    listener_2 = callback(MagicMock())
+
+    dispatcher.async_subscribe(["sensor.test"], listener_1)
+    dispatcher.async_subscribe(["sensor.test"], listener_2)
+
+    hass.states.async_set("sensor.test", 1)
+    await hass.async_block_till_done()
+
+    assert listener_2.called
+    assert "Error while dispatching event for sensor.test" in caplog.text
+
+
+async def test_dispatch_reported(hass):
+    """Test dispatching of state reports."""
+    dispatcher = async_get_dispatcher(hass, EVENT_STATE_REPORTED)
+    assert dispatcher is not async_get_dispatcher(hass)
+    listener = callback(MagicMock())
+    dispatcher.async_subscribe(["sensor.test"], listener)
+
+    hass.states.async_set("sensor.test", 1)
+    hass.states.async_set("sensor.test", 1)
+    await hass.async_block_till_done()
+
+    assert [x[0][0].event_type for x in listener.call_args_list] == [
+        EVENT_STATE_CHANGED,
+        EVENT_STATE_REPORTED,
+    ]
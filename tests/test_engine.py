@@ -0,0 +1,60 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""Test backup_source failover engine."""
+
+import pytest
+
+from custom_components.backup_source.engine import FailoverEngine, lowest_bit
+
+
+@pytest.mark.parametrize(
+    ("mask", "expected"),
+    [
+        (0, -1),
+        (0b1, 0),
+        (0b1010, 1),
+        (1 << 40, 40),
+    ],
+)
+def test_lowest_bit(mask, expected):
+    """Test lowest_bit function."""
+    assert lowest_bit(mask) == expected
+
+
+def test_reset():
+    """Test FailoverEngine.reset method."""
+    engine = FailoverEngine()
+    assert engine.active == -1
+
+    assert engine.reset([False, True, True]) == 1
+    assert engine.active == 1
+    assert engine.mask == 0b110
+    assert engine.is_eligible(1)
+    assert not engine.is_eligible(0)
+
+    assert engine.reset([False, False]) == -1
+
+
+def test_update():
+    """Test FailoverEngine.update method."""
+    engine = FailoverEngine()
+    engine.reset([False, True, False, True])
+
+    # Changes below the active source don't switch anything
+    assert engine.update(2, eligible=True) is False
+    assert engine.update(3, eligible=False) is False
+    assert engine.active == 1
+
+    # Active source has lost its value
+    assert engine.update(1, eligible=False) is True
+    assert engine.active == 2
+
+    # Higher priority source got a value
+    assert engine.update(0, eligible=True) is True
+    assert engine.active == 0
+    assert engine.update(0, eligible=True) is False
+
+    engine.update(0, eligible=False)
+    engine.update(2, eligible=False)
+    assert engine.active == -1
+    assert engine.update(3, eligible=True) is True
+    assert engine.active == 3
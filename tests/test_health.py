@@ -0,0 +1,77 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""Test backup_source health scoring."""
+
+from unittest.mock import patch
+
+import pytest
+from homeassistant.helpers.storage import Store
+
+from custom_components.backup_source.health import (
+    STORAGE_KEY,
+    HealthStore,
+    SourceHealth,
+    async_get_health_store,
+)
+
+HALF_LIFE = 100.0
+
+
+def test_update():
+    """Test SourceHealth.update method."""
+    health = SourceHealth()
+    assert health.score(1000, HALF_LIFE) == (1.0, 0.0)
+
+    health.update(1000, HALF_LIFE, available=False)
+    assert health.score(1000, HALF_LIFE) == (1.0, 0.0)
+
+    # Source has been unavailable for one half-life
+    health.update(1100, HALF_LIFE, available=True)
+    assert health.availability == pytest.approx(0.5)
+    assert health.rate > 0
+
+    # Score recovers while source stays available
+    availability, rate = health.score(1200, HALF_LIFE)
+    assert availability == pytest.approx(0.75)
+    assert rate == pytest.approx(health.rate / 2)
+
+    # Uncounted updates decay the rate without adding to it
+    health.update(1200, HALF_LIFE, available=True, count=False)
+    assert health.score(1200, HALF_LIFE) == pytest.approx((availability, rate))
+
+
+async def test_health_store(hass, hass_storage):
+    """Test health scores are loaded and saved."""
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": STORAGE_KEY,
+        "data": {"sensor.test": {"sensor.test_1": [0.5, 0.1, 1000.0, True]}},
+    }
+
+    store = await async_get_health_store(hass)
+    assert isinstance(store, HealthStore)
+    assert await async_get_health_store(hass) is store
+
+    records = store.async_get_records("sensor.test", ["sensor.test_2", "sensor.test_1"])
+    assert records[0].as_list() == [1.0, 0.0, 0.0, False]
+    assert records[1].as_list() == [0.5, 0.1, 1000.0, True]
+
+    records = store.async_get_records("sensor.test", ["sensor.test_2"])
+    records[0].update(1000, HALF_LIFE, available=True)
+    assert store._data_to_save() == {
+        "sensor.test": {"sensor.test_2": [1.0, 0.0, 1000.0, True]},
+    }
+
+
+async def test_health_store_save(hass):
+    """Test changes of scores don't push back pending write."""
+    store = await async_get_health_store(hass)
+    with patch.object(Store, "async_delay_save") as delay_save:
+        store.async_mark_dirty()
+        store.async_mark_dirty()
+        assert delay_save.call_count == 1
+
+        # Changes after a write schedule the next one
+        delay_save.call_args[0][0]()
+        store.async_mark_dirty()
+        assert delay_save.call_count == 2
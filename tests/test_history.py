@@ -0,0 +1,191 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""Test backup_source backfill of source states."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from homeassistant.components.recorder import Recorder, get_instance, history
+from homeassistant.components.sensor import DOMAIN as DOMAIN_SENSOR
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_RESTORED,
+    CONF_NAME,
+    CONF_PLATFORM,
+    EVENT_HOMEASSISTANT_START,
+    STATE_UNAVAILABLE,
+)
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import assert_setup_component
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.backup_source.const import (
+    ATTR_SOURCE,
+    CONF_ADAPTIVE,
+    CONF_SOURCES,
+    DOMAIN,
+)
+from custom_components.backup_source.health import STORAGE_KEY
+from custom_components.backup_source.history import (
+    _last_good_states,
+    async_get_source_history,
+)
+
+
+# Recorder must be set up before Home Assistant, so it goes first here
+@pytest.fixture(autouse=True)
+def _auto_enable_custom_integrations(
+    recorder_mock: Recorder,
+    enable_custom_integrations: None,
+) -> None:
+    """Automatically enable loading custom integrations with recorder."""
+    return
+
+
+async def test_backfill(hass: HomeAssistant) -> None:
+    """Test sources missing on start are backfilled with one job on setup."""
+    hass.states.async_set("sensor.test_1", 11)
+    hass.states.async_set("sensor.test_1", STATE_UNAVAILABLE)
+    hass.states.async_set("sensor.test_2", 22)
+    await async_wait_recording_done(hass)
+
+    # Upstream integrations have not loaded their entities yet
+    hass.states.async_remove("sensor.test_1")
+    hass.states.async_set("sensor.test_2", STATE_UNAVAILABLE, {ATTR_RESTORED: True})
+    await hass.async_block_till_done()
+
+    hass.set_state(CoreState.not_running)
+    config = {
+        DOMAIN_SENSOR: [
+            {
+                CONF_PLATFORM: DOMAIN,
+                CONF_NAME: "backup_1",
+                CONF_SOURCES: ["sensor.test_1", "sensor.test_2"],
+            },
+            {
+                CONF_PLATFORM: DOMAIN,
+                CONF_NAME: "backup_2",
+                CONF_SOURCES: ["sensor.test_2", "sensor.test_3"],
+            },
+        ],
+    }
+    with patch(
+        "custom_components.backup_source.history._last_good_states",
+        side_effect=_last_good_states,
+    ) as query:
+        with assert_setup_component(2, DOMAIN_SENSOR):
+            assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+        await hass.async_block_till_done()
+
+    assert query.call_count == 1
+    assert query.call_args[0][1] == ["sensor.test_1", "sensor.test_2", "sensor.test_3"]
+
+    # Recorded states are shown before Home Assistant has started
+    state = hass.states.get("sensor.backup_1")
+    assert state.state == "11"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_1"
+    state = hass.states.get("sensor.backup_2")
+    assert state.state == "22"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_2"
+
+    with patch(
+        "custom_components.backup_source.history._last_good_states",
+        side_effect=_last_good_states,
+    ) as query:
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+        await hass.async_block_till_done()
+    assert query.call_count == 0
+    assert hass.states.get("sensor.backup_1").state == "11"
+
+    # Live states replace recorded ones
+    hass.states.async_set("sensor.test_1", STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.backup_1")
+    assert state.state == "22"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_2"
+
+    # Already loaded states are not queried again
+    with patch(
+        "custom_components.backup_source.history._last_good_states",
+        side_effect=_last_good_states,
+    ) as query:
+        states = await async_get_source_history(hass).async_get_states(
+            ["sensor.test_1", "sensor.test_3"]
+        )
+    assert query.call_count == 0
+    assert list(states) == ["sensor.test_1"]
+    assert states["sensor.test_1"].state == "11"
+
+
+async def test_backfill_group(hass: HomeAssistant, hass_storage) -> None:
+    """Test members of groups are backfilled and keep their health scores."""
+    hass.states.async_set("sensor.test_1", 11)
+    await async_wait_recording_done(hass)
+    hass.states.async_remove("sensor.test_1")
+    hass.states.async_set("group.test", "on", {ATTR_ENTITY_ID: ["sensor.test_1"]})
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": STORAGE_KEY,
+        "data": {
+            "sensor.backup": {
+                "sensor.test_2": [0.5, 0.1, dt_util.utcnow().timestamp(), False]
+            }
+        },
+    }
+
+    hass.set_state(CoreState.not_running)
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "backup",
+            CONF_SOURCES: ["group.test", "group.late"],
+            CONF_ADAPTIVE: True,
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.backup")
+    assert state.state == "11"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_1"
+
+    # Scores of members of groups set up later are kept until start
+    hass.states.async_set("sensor.test_2", 22)
+    hass.states.async_set("group.late", "on", {ATTR_ENTITY_ID: ["sensor.test_2"]})
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    await hass.async_block_till_done()
+
+    entity = hass.data[DOMAIN]["entities"]["sensor.backup"]
+    assert entity.sources == ["sensor.test_1", "sensor.test_2"]
+    assert entity._health[1].availability == pytest.approx(0.5, abs=0.01)
+
+
+async def test_last_good_states(hass: HomeAssistant) -> None:
+    """Test history is searched back in growing windows."""
+    hass.states.async_set("sensor.test_1", 1)
+    hass.states.async_set("sensor.test_2", 2)
+    hass.states.async_set("sensor.test_2", STATE_UNAVAILABLE)
+    await async_wait_recording_done(hass)
+
+    now = dt_util.utcnow() + timedelta(hours=2)
+    with patch(
+        "homeassistant.components.recorder.history.get_significant_states",
+        side_effect=history.get_significant_states,
+    ) as query:
+        states = await get_instance(hass).async_add_executor_job(
+            _last_good_states, hass, ["sensor.test_1", "sensor.test_2"], now
+        )
+    assert {entity_id: state.state for entity_id, state in states.items()} == {
+        "sensor.test_1": "1",
+        "sensor.test_2": "2",
+    }
+
+    # Nothing is found in first two windows, so the third one is queried
+    assert query.call_count == 3
+    assert query.call_args_list[-1][0][1] == now - timedelta(hours=6)
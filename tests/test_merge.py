@@ -0,0 +1,72 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""Test backup_source field-level merging."""
+
+from homeassistant.core import State
+
+from custom_components.backup_source.merge import FieldMerge
+
+FIELDS = {
+    "temperature": ("temperature_unit",),
+    "ozone": (),
+}
+
+
+def test_reset():
+    """Test FieldMerge.reset method."""
+    merge = FieldMerge(FIELDS)
+    states = [
+        State("weather.test_1", "sunny", {"temperature": 20}),
+        State("weather.test_2", "sunny", {"temperature": 21, "ozone": 5}),
+        None,
+    ]
+    merge.reset(states, 0b011)
+    assert merge.providers == {"temperature": 0, "ozone": 1}
+
+    merge.reset(states, 0b001)
+    assert merge.providers == {"temperature": 0, "ozone": -1}
+
+
+def test_update():
+    """Test FieldMerge.update method."""
+    merge = FieldMerge(FIELDS)
+    states = [
+        State("weather.test_1", "sunny", {"temperature": 20}),
+        State("weather.test_2", "sunny", {"temperature": 21, "ozone": 5}),
+    ]
+    merge.reset(states, 0b11)
+
+    # Values of fields may change without change of their providers
+    states[1] = State("weather.test_2", "sunny", {"temperature": 21, "ozone": 6})
+    assert merge.update(1, states[1], eligible=True)
+
+    states[0] = State("weather.test_1", "sunny", {"ozone": 4})
+    assert merge.update(0, states[0], eligible=True)
+    assert merge.providers == {"temperature": 1, "ozone": 0}
+
+    assert merge.update(0, None, eligible=False)
+    assert merge.providers == {"temperature": 1, "ozone": 1}
+
+
+def test_compose():
+    """Test FieldMerge.compose method."""
+    merge = FieldMerge(FIELDS)
+    states = [
+        State("weather.test_1", "sunny", {"ozone": 4, "humidity": 50}),
+        State(
+            "weather.test_2",
+            "rainy",
+            {"temperature": 70, "temperature_unit": "°F", "ozone": 5},
+        ),
+    ]
+    merge.reset(states, 0b11)
+
+    state = merge.compose(states[0], states)
+    assert state.entity_id == "weather.test_1"
+    assert state.state == "sunny"
+    assert state.last_updated == states[0].last_updated
+    assert state.attributes == {
+        "temperature": 70,
+        "temperature_unit": "°F",
+        "ozone": 4,
+        "humidity": 50,
+    }
@@ -0,0 +1,59 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""Test backup_source failover metrics."""
+
+import pytest
+
+from custom_components.backup_source.metrics import FailoverMetrics, percentile
+
+
+@pytest.mark.parametrize(
+    ("fraction", "expected"),
+    [
+        (0.0, 1.0),
+        (0.5, 5.0),
+        (0.99, 10.0),
+        (1.0, 10.0),
+    ],
+)
+def test_percentile(fraction, expected):
+    """Test percentile function."""
+    samples = [float(x) for x in range(1, 11)]
+    assert percentile(samples, fraction) == expected
+    assert percentile([], fraction) is None
+
+
+def test_record_event():
+    """Test FailoverMetrics.record_event method."""
+    metrics = FailoverMetrics()
+    assert metrics.as_dict()["latency_p50_ms"] is None
+
+    metrics.record_event(0.001, changed=True)
+    metrics.record_event(0.002, changed=False)
+    metrics.record_event(0.003, changed=False)
+
+    data = metrics.as_dict()
+    assert data["events_processed"] == 1
+    assert data["events_ignored"] == 2
+    assert data["latency_p50_ms"] == 2.0
+    assert data["latency_p99_ms"] == 3.0
+
+
+def test_record_selection(freezer):
+    """Test FailoverMetrics.record_selection method."""
+    metrics = FailoverMetrics()
+    metrics.record_selection("sensor.test_1")
+    metrics.record_selection("sensor.test_1")
+    assert metrics.switches == 0
+
+    freezer.tick(10)
+    metrics.record_selection("sensor.test_2")
+    freezer.tick(5)
+    metrics.record_selection(None)
+    freezer.tick(5)
+    metrics.record_selection("sensor.test_1")
+    freezer.tick(1)
+
+    data = metrics.as_dict()
+    assert data["switches"] == 3
+    assert data["active_source"] == "sensor.test_1"
+    assert data["active_time"] == {"sensor.test_1": 11.0, "sensor.test_2": 5.0}
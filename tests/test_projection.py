@@ -0,0 +1,62 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""Test backup_source projections of state attributes."""
+
+import pytest
+from homeassistant.const import (
+    ATTR_ASSUMED_STATE,
+    ATTR_ICON,
+    ATTR_UNIT_OF_MEASUREMENT,
+    CONF_NAME,
+    CONF_PLATFORM,
+)
+from homeassistant.core import HomeAssistant, State
+
+from custom_components.backup_source import BackupSourceEntity
+from custom_components.backup_source.const import (
+    CONF_SKIP_NO_VALUE,
+    CONF_SOURCES,
+    DOMAIN,
+)
+from custom_components.backup_source.projection import EntityProjection
+
+
+def test_projection() -> None:
+    """Test attributes are projected into slots."""
+    state = State("sensor.test", "1", {ATTR_ICON: "mdi:test", "foo": "bar"})
+    fields = EntityProjection(state)
+
+    assert fields.state is state
+    assert fields.icon == "mdi:test"
+    assert fields.unit_of_measurement is None
+    assert not hasattr(fields, "__dict__")
+    with pytest.raises(AttributeError):
+        fields.foo = "bar"
+
+
+async def test_entity_projection(hass: HomeAssistant) -> None:
+    """Test entity properties read projection of the exposed state."""
+    hass.states.async_set("sensor.test_1", 1, {ATTR_UNIT_OF_MEASUREMENT: "°C"})
+    hass.states.async_set("sensor.test_2", 2, {ATTR_ASSUMED_STATE: True})
+    entity = BackupSourceEntity(
+        hass,
+        {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["sensor.test_1", "sensor.test_2"],
+            CONF_SKIP_NO_VALUE: True,
+        },
+    )
+    await entity.async_update()
+    assert entity.unit_of_measurement == "°C"
+    assert entity.assumed_state is False
+
+    # Projection is rebuilt only when another state is exposed
+    fields = entity._fields
+    entity._async_select()
+    assert entity._fields is fields
+
+    hass.states.async_set("sensor.test_1", "unavailable")
+    entity._async_source_changed("sensor.test_1", hass.states.get("sensor.test_1"))
+    assert entity._fields is not fields
+    assert entity.unit_of_measurement is None
+    assert entity.assumed_state is True
@@ -1,23 +1,66 @@
 # pylint: disable=protected-access,redefined-outer-name
 """Test backup_source setup process."""
 
-from unittest.mock import MagicMock
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
 
 import pytest
 from homeassistant.components.sensor import DOMAIN as DOMAIN_SENSOR
 from homeassistant.components.template import DOMAIN as DOMAIN_TEMPLATE
 from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_UNIT_OF_MEASUREMENT,
+    CONF_ENTITY_ID,
+    CONF_EXCLUDE,
     CONF_NAME,
     CONF_PLATFORM,
     CONF_SENSORS,
     CONF_UNIQUE_ID,
+    CONF_UNIT_OF_MEASUREMENT,
     CONF_VALUE_TEMPLATE,
+    EVENT_HOMEASSISTANT_START,
+    EVENT_STATE_CHANGED,
+    SERVICE_RELOAD,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+    UnitOfTemperature,
 )
+from homeassistant.core import CoreState, State, StateMachine
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import async_setup_component
-from pytest_homeassistant_custom_component.common import assert_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    assert_setup_component,
+    async_capture_events,
+    async_fire_time_changed,
+    mock_restore_cache,
+)
 
 from custom_components.backup_source import CONF_SKIP_NO_VALUE, CONF_SOURCES, DOMAIN
+from custom_components.backup_source.const import (
+    ATTR_SOURCE,
+    CHANGE_DETECTION_EXPOSED,
+    CHANGE_DETECTION_FULL,
+    CHANGE_DETECTION_VALUE,
+    CONF_ADAPTIVE,
+    CONF_ATTRIBUTES,
+    CONF_CHANGE_DETECTION,
+    CONF_DEBOUNCE,
+    CONF_FAILBACK_DELAY,
+    CONF_MAX_AGE,
+    CONF_MIN_HOLD_TIME,
+    CONF_PRIORITY,
+    CONF_QUORUM,
+    CONF_STRATEGY,
+    CONF_TOLERANCE,
+    SERVICE_GET_METRICS,
+    STRATEGY_FRESHEST,
+    STRATEGY_MEAN,
+    STRATEGY_MEDIAN,
+    STRATEGY_QUORUM,
+)
+from custom_components.backup_source.dispatcher import async_get_dispatcher
 from custom_components.backup_source.sensor import (
     BackupSourceSensor,
     async_setup_platform,
@@ -73,3 +116,871 @@ async def test_sensor(hass, caplog, test_entities, config):
     assert entity.native_value == "20"
     assert entity.native_unit_of_measurement is None
     assert entity.last_reset is None
+
+
+async def test_sensor_tracking(hass):
+    """Test sensor follows state changes of sources."""
+    hass.states.async_set("sensor.test_1", 1)
+    hass.states.async_set("sensor.test_2", 2)
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["sensor.test_1", "sensor.test_2"],
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.test").state == "1"
+
+    hass.states.async_set("sensor.test_1", STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test")
+    assert state.state == "2"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_2"
+
+    hass.states.async_set("sensor.test_1", 11)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "11"
+
+
+async def test_sensor_single_pass_per_event(hass):
+    """Test each source event causes one selection pass and one state write."""
+    sources = [f"sensor.test_{i}" for i in range(5)]
+    for i, entity_id in enumerate(sources):
+        hass.states.async_set(entity_id, i)
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: sources,
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+
+    writes = async_capture_events(hass, EVENT_STATE_CHANGED)
+    with patch.object(
+        StateMachine, "get", autospec=True, side_effect=StateMachine.get
+    ) as states_get:
+        hass.states.async_set("sensor.test_0", 10)
+        await hass.async_block_till_done()
+        assert states_get.call_count == 0
+        assert sorted(x.data["entity_id"] for x in writes) == [
+            "sensor.test",
+            "sensor.test_0",
+        ]
+
+        writes.clear()
+        hass.states.async_set("sensor.test_3", 33)
+        await hass.async_block_till_done()
+        assert states_get.call_count == 0
+        assert [x.data["entity_id"] for x in writes] == ["sensor.test_3"]
+
+    assert hass.states.get("sensor.test").state == "10"
+
+
+@pytest.mark.parametrize(
+    ("mode", "expected"),
+    [
+        (CHANGE_DETECTION_FULL, [True, True, True]),
+        (CHANGE_DETECTION_EXPOSED, [False, True, True]),
+        (CHANGE_DETECTION_VALUE, [False, False, True]),
+    ],
+)
+async def test_sensor_change_detection(hass, mode, expected):
+    """Test state writes with different change detection modes."""
+    hass.states.async_set("sensor.test_1", 1, {"foo": "bar"})
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["sensor.test_1"],
+            CONF_CHANGE_DETECTION: mode,
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+
+    written = []
+    with patch.object(
+        BackupSourceSensor,
+        "async_write_ha_state",
+        autospec=True,
+        side_effect=BackupSourceSensor.async_write_ha_state,
+    ) as write_state:
+        for value, attributes in [(1, {"foo": "bar"}), (1, {"foo": "baz"}), (2, {})]:
+            write_state.reset_mock()
+            hass.states.async_set("sensor.test_1", value, attributes, force_update=True)
+            await hass.async_block_till_done()
+            written.append(write_state.called)
+
+    assert written == expected
+
+
+async def test_sensor_change_detection_projected(hass):
+    """Test change of a projected field only is written."""
+    hass.states.async_set("sensor.test_1", 1, {ATTR_UNIT_OF_MEASUREMENT: "°C"})
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["sensor.test_1"],
+            CONF_ATTRIBUTES: {CONF_EXCLUDE: [ATTR_UNIT_OF_MEASUREMENT]},
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.test_1", 1, {ATTR_UNIT_OF_MEASUREMENT: "°F"})
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").attributes[ATTR_UNIT_OF_MEASUREMENT] == "°F"
+
+
+async def test_sensor_debounce(hass):
+    """Test bursts of source updates are coalesced."""
+    hass.states.async_set("sensor.test_1", 0)
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["sensor.test_1"],
+            CONF_DEBOUNCE: {"seconds": 5},
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+
+    with patch.object(
+        BackupSourceSensor,
+        "async_write_ha_state",
+        autospec=True,
+        side_effect=BackupSourceSensor.async_write_ha_state,
+    ) as write_state:
+        # Isolated change is published without delay
+        hass.states.async_set("sensor.test_1", 1)
+        await hass.async_block_till_done()
+        assert write_state.call_count == 1
+        assert hass.states.get("sensor.test").state == "1"
+
+        for value in range(2, 6):
+            hass.states.async_set("sensor.test_1", value)
+            await hass.async_block_till_done()
+        assert write_state.call_count == 1
+        assert hass.states.get("sensor.test").state == "1"
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=6))
+        await hass.async_block_till_done()
+        assert write_state.call_count == 2
+        assert hass.states.get("sensor.test").state == "5"
+
+    # Let the cooldown of the last write expire
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=12))
+    await hass.async_block_till_done()
+
+
+async def test_sensor_strategy_freshest(hass):
+    """Test sensor follows the most recently updated source."""
+    hass.states.async_set("sensor.test_1", 1)
+    hass.states.async_set("sensor.test_2", 2)
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["sensor.test_1", "sensor.test_2"],
+            CONF_STRATEGY: STRATEGY_FRESHEST,
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "2"
+
+    hass.states.async_set("sensor.test_1", 11)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test")
+    assert state.state == "11"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_1"
+
+    hass.states.async_set("sensor.test_1", STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "2"
+
+
+@pytest.mark.parametrize(
+    ("strategy", "expected"),
+    [
+        (STRATEGY_MEDIAN, ["21.5", "22.0", "22.0"]),
+        (STRATEGY_MEAN, ["21.0", "21.5", "22.0"]),
+        (STRATEGY_QUORUM, ["21.5", "unknown", "22.0"]),
+    ],
+)
+async def test_sensor_strategy_numeric(hass, strategy, expected):
+    """Test sensor aggregates values of all sources."""
+    hass.states.async_set("sensor.test_1", "20.0")
+    hass.states.async_set("sensor.test_2", "21.0")
+    hass.states.async_set("sensor.test_3", "22.0")
+    hass.states.async_set("sensor.test_4", "100.0")
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: [
+                "sensor.test_1",
+                "sensor.test_2",
+                "sensor.test_3",
+                "sensor.test_4",
+            ],
+            CONF_STRATEGY: strategy,
+            CONF_TOLERANCE: 2,
+            CONF_QUORUM: 3,
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test")
+    assert state.state == expected[0]
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_1"
+
+    hass.states.async_set("sensor.test_1", STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test")
+    assert state.state == expected[1]
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_2"
+
+    hass.states.async_set("sensor.test_4", 23)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == expected[2]
+
+
+async def test_sensor_strategy_precision(hass):
+    """Test aggregated values are formatted with precision of sources."""
+    hass.states.async_set("sensor.test_1", "20.1")
+    hass.states.async_set("sensor.test_2", "20.2")
+    hass.states.async_set("sensor.test_3", "20.2")
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["sensor.test_1", "sensor.test_2", "sensor.test_3"],
+            CONF_STRATEGY: STRATEGY_MEAN,
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+    # Mean is 20.1666...
+    assert hass.states.get("sensor.test").state == "20.2"
+
+    # Values of sources with more decimal places are kept
+    hass.states.async_set("sensor.test_3", "20.25")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "20.18"
+
+    # Sources reporting integers give an integer
+    hass.states.async_set("sensor.test_1", "21")
+    hass.states.async_set("sensor.test_2", "21")
+    hass.states.async_set("sensor.test_3", "21")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "21"
+
+
+async def test_sensor_unit_normalization(hass, caplog):
+    """Test values of sources are converted to the same unit."""
+    hass.states.async_set(
+        "sensor.test_1", 212, {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.FAHRENHEIT}
+    )
+    hass.states.async_set(
+        "sensor.test_2", 20, {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS}
+    )
+    hass.states.async_set("sensor.test_3", 30, {ATTR_UNIT_OF_MEASUREMENT: "%"})
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["sensor.test_1", "sensor.test_2", "sensor.test_3"],
+            CONF_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS,
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test")
+    assert state.state == "100"
+    assert state.attributes[ATTR_UNIT_OF_MEASUREMENT] == UnitOfTemperature.CELSIUS
+
+    hass.states.async_set(
+        "sensor.test_1",
+        STATE_UNAVAILABLE,
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.FAHRENHEIT},
+    )
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test")
+    assert float(state.state) == 20
+    assert state.attributes[ATTR_UNIT_OF_MEASUREMENT] == UnitOfTemperature.CELSIUS
+
+    # Sources with incompatible units are skipped
+    hass.states.async_set(
+        "sensor.test_2",
+        STATE_UNAVAILABLE,
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == STATE_UNKNOWN
+    assert 'Unable to convert values of "sensor.test_3"' in caplog.text
+
+
+async def test_sensor_unit_normalization_precision(hass):
+    """Test converted values are rounded to precision of source."""
+    registry = er.async_get(hass)
+    entry = registry.async_get_or_create(
+        DOMAIN_SENSOR, "test", "test_1", suggested_object_id="test_1"
+    )
+    hass.states.async_set(
+        "sensor.test_1",
+        "70.5",
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.FAHRENHEIT},
+    )
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["sensor.test_1"],
+            CONF_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS,
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "21.4"
+
+    # Display precision of source sensor is preferred
+    registry.async_update_entity_options(
+        entry.entity_id, DOMAIN_SENSOR, {"suggested_display_precision": 2}
+    )
+    hass.states.async_set(
+        "sensor.test_1", "70", {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.FAHRENHEIT}
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "21.11"
+
+
+async def test_sensor_unit_normalization_median(hass):
+    """Test values of sources are converted before aggregation."""
+    hass.states.async_set(
+        "sensor.test_1", 50, {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.FAHRENHEIT}
+    )
+    hass.states.async_set(
+        "sensor.test_2", 20, {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS}
+    )
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["sensor.test_1", "sensor.test_2"],
+            CONF_STRATEGY: STRATEGY_MEDIAN,
+            CONF_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS,
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test")
+    assert state.state == "15"
+    assert state.attributes[ATTR_UNIT_OF_MEASUREMENT] == UnitOfTemperature.CELSIUS
+
+    # Converted values are aggregated at precision of sources
+    hass.states.async_set(
+        "sensor.test_1",
+        "69.5",
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.FAHRENHEIT},
+    )
+    hass.states.async_set(
+        "sensor.test_2", "20.8", {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS}
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "20.8"
+
+
+async def test_sensor_metrics(hass):
+    """Test failover metrics are returned by service."""
+    hass.states.async_set("sensor.test_1", 1)
+    hass.states.async_set("sensor.test_2", 2)
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["sensor.test_1", "sensor.test_2"],
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.test_2", 22)
+    hass.states.async_set("sensor.test_1", STATE_UNAVAILABLE)
+    hass.states.async_set("sensor.test_1", 11)
+    await hass.async_block_till_done()
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_METRICS, {}, blocking=True, return_response=True
+    )
+    metrics = response["sensor.test"]
+    assert metrics["active_source"] == "sensor.test_1"
+    assert metrics["switches"] == 2
+    assert set(metrics["active_time"]) == {"sensor.test_1", "sensor.test_2"}
+    assert metrics["events_processed"] == 2
+    assert metrics["events_ignored"] == 1
+    assert metrics["latency_p50_ms"] >= 0
+    assert metrics["latency_p99_ms"] >= metrics["latency_p50_ms"]
+
+    # Writing of the state is not counted in latency of selection
+    entity = hass.data[DOMAIN]["entities"]["sensor.test"]
+    clock = [0.0]
+
+    def write_state() -> None:
+        clock[0] += 1.0
+
+    with (
+        patch(
+            "custom_components.backup_source.time.perf_counter",
+            side_effect=lambda: clock[0],
+        ),
+        patch.object(entity, "async_write_ha_state", side_effect=write_state),
+    ):
+        hass.states.async_set("sensor.test_1", 12)
+        await hass.async_block_till_done()
+    assert clock[0] == 1.0
+    assert entity.metrics.as_dict()["latency_p99_ms"] < 1000
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_METRICS,
+        {ATTR_ENTITY_ID: "sensor.unknown"},
+        blocking=True,
+        return_response=True,
+    )
+    assert response == {}
+
+
+async def test_sensor_hysteresis(hass, freezer):
+    """Test switching back to a recovered source is delayed."""
+    hass.states.async_set("sensor.test_1", 1)
+    hass.states.async_set("sensor.test_2", 2)
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["sensor.test_1", "sensor.test_2"],
+            CONF_MIN_HOLD_TIME: {"seconds": 10},
+            CONF_FAILBACK_DELAY: {"seconds": 30},
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "1"
+
+    # Failover is immediate
+    hass.states.async_set("sensor.test_1", STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "2"
+
+    # Primary flaps within failback delay
+    hass.states.async_set("sensor.test_1", 1)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "2"
+
+    freezer.tick(timedelta(seconds=20))
+    async_fire_time_changed(hass)
+    hass.states.async_set("sensor.test_1", STATE_UNAVAILABLE)
+    hass.states.async_set("sensor.test_1", 11)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "2"
+
+    freezer.tick(timedelta(seconds=20))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "2"
+
+    # Primary has been healthy long enough
+    freezer.tick(timedelta(seconds=11))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test")
+    assert state.state == "11"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_1"
+
+
+async def test_sensor_min_hold_time(hass, freezer):
+    """Test selected source is held for minimal time."""
+    hass.states.async_set("sensor.test_1", STATE_UNAVAILABLE)
+    hass.states.async_set("sensor.test_2", 2)
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["sensor.test_1", "sensor.test_2"],
+            CONF_MIN_HOLD_TIME: {"seconds": 10},
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "2"
+
+    freezer.tick(timedelta(seconds=5))
+    hass.states.async_set("sensor.test_1", 1)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "2"
+
+    freezer.tick(timedelta(seconds=6))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "1"
+
+
+async def test_sensor_max_age(hass, freezer):
+    """Test sources which stopped reporting are skipped."""
+    hass.states.async_set("sensor.test_1", 1)
+    hass.states.async_set("sensor.test_2", 2)
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["sensor.test_1", "sensor.test_2"],
+            CONF_MAX_AGE: {"minutes": 5},
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "1"
+
+    # Reports of unchanged values keep the source alive
+    freezer.tick(timedelta(minutes=3))
+    hass.states.async_set("sensor.test_1", 1)
+    hass.states.async_set("sensor.test_2", 2)
+    await hass.async_block_till_done()
+
+    freezer.tick(timedelta(minutes=3))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "1"
+
+    freezer.tick(timedelta(minutes=3))
+    hass.states.async_set("sensor.test_2", 22)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test")
+    assert state.state == "22"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_2"
+
+    hass.states.async_set("sensor.test_1", 11)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "11"
+
+
+async def test_sensor_reload(hass):
+    """Test reloading of entities."""
+    hass.states.async_set("sensor.test_1", 1)
+    hass.states.async_set("sensor.test_2", 2)
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["sensor.test_1"],
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "1"
+
+    config[DOMAIN_SENSOR][CONF_SOURCES] = ["sensor.test_2"]
+    with patch(
+        "homeassistant.config.load_yaml_config_file", autospec=True, return_value=config
+    ):
+        await hass.services.async_call(DOMAIN, SERVICE_RELOAD, {}, blocking=True)
+        await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test")
+    assert state.state == "2"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_2"
+
+    # New entity tracks its sources without a restart
+    hass.states.async_set("sensor.test_2", 22)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "22"
+
+
+async def test_sensor_startup(hass):
+    """Test sources are tracked once Home Assistant is starting."""
+    hass.set_state(CoreState.not_running)
+    hass.states.async_set("sensor.test_1", STATE_UNAVAILABLE)
+    hass.states.async_set("sensor.test_2", 2)
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["sensor.test_1", "sensor.test_2"],
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == STATE_UNAVAILABLE
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "2"
+
+
+async def test_sensor_adaptive(hass, freezer):
+    """Test the healthiest source is chosen among ones of the same priority."""
+    hass.states.async_set("sensor.test_1", 1)
+    hass.states.async_set("sensor.test_2", 2)
+    hass.states.async_set("sensor.test_3", 3)
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: [["sensor.test_1", "sensor.test_2"], "sensor.test_3"],
+            CONF_ADAPTIVE: True,
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "1"
+
+    # First source has been unavailable for a long time
+    hass.states.async_set("sensor.test_1", STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+    freezer.tick(timedelta(hours=1))
+    hass.states.async_set("sensor.test_1", 11)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "2"
+
+    # Second source has a short outage only
+    hass.states.async_set("sensor.test_2", STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "11"
+
+    freezer.tick(timedelta(minutes=1))
+    hass.states.async_set("sensor.test_2", 22)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "22"
+
+    # Sources of lower priority tier are not chosen while others have a value
+    hass.states.async_set("sensor.test_3", 33)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "22"
+
+
+async def test_sensor_adaptive_priority(hass, freezer):
+    """Test sources with equal priority share a tier wherever they are listed."""
+    hass.states.async_set("sensor.test_1", 1)
+    hass.states.async_set("sensor.test_2", 2)
+    hass.states.async_set("sensor.test_3", 3)
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: [
+                {CONF_ENTITY_ID: "sensor.test_1", CONF_PRIORITY: 1},
+                "sensor.test_2",
+                {CONF_ENTITY_ID: "sensor.test_3", CONF_PRIORITY: 1},
+            ],
+            CONF_ADAPTIVE: True,
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+
+    entity = hass.data[DOMAIN]["entities"]["sensor.test"]
+    assert entity.sources == ["sensor.test_1", "sensor.test_3", "sensor.test_2"]
+    assert [record.tier for record in entity._records] == [0, 0, 1]
+
+    # Healthier source of the same priority is chosen
+    hass.states.async_set("sensor.test_1", STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "3"
+    freezer.tick(timedelta(hours=1))
+    hass.states.async_set("sensor.test_1", 11)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "3"
+
+
+async def test_sensor_adaptive_restored(hass, hass_storage):
+    """Test health scores are restored from storage."""
+    now = dt_util.utcnow().timestamp()
+    hass_storage["backup_source.health"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": "backup_source.health",
+        "data": {
+            "sensor.test": {
+                "sensor.test_1": [0.5, 0.0, now, True],
+                "sensor.test_2": [1.0, 0.0, now, True],
+            },
+        },
+    }
+    hass.states.async_set("sensor.test_1", 1)
+    hass.states.async_set("sensor.test_2", 2)
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: [["sensor.test_1", "sensor.test_2"]],
+            CONF_ADAPTIVE: True,
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "2"
+
+
+async def test_sensor_restore_state(hass):
+    """Test last output is restored until sources are reconciled."""
+    hass.set_state(CoreState.not_running)
+    mock_restore_cache(
+        hass,
+        [
+            State(
+                "sensor.test",
+                "15",
+                {
+                    ATTR_SOURCE: "sensor.test_2",
+                    ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS,
+                },
+            )
+        ],
+    )
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["sensor.test_1", "sensor.test_2"],
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test")
+    assert state.state == "15"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_2"
+    assert state.attributes[ATTR_UNIT_OF_MEASUREMENT] == UnitOfTemperature.CELSIUS
+
+    hass.states.async_set("sensor.test_1", 1)
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test")
+    assert state.state == "1"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_1"
+
+
+async def test_sensor_restore_state_skipped(hass):
+    """Test last output is not restored if sources already have a value."""
+    mock_restore_cache(hass, [State("sensor.test", "15")])
+    hass.states.async_set("sensor.test_1", 1)
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["sensor.test_1"],
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "1"
+
+
+async def test_sensor_group_tracking(hass):
+    """Test membership changes of source groups are tracked."""
+    hass.states.async_set("sensor.test_1", STATE_UNAVAILABLE)
+    hass.states.async_set("sensor.test_2", 2)
+    hass.states.async_set("sensor.test_3", 3)
+    hass.states.async_set("group.test", "on", {ATTR_ENTITY_ID: ["sensor.test_1"]})
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["group.test", "sensor.test_3"],
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "3"
+
+    dispatcher = async_get_dispatcher(hass)
+    assert dispatcher.entity_ids == {"sensor.test_1", "sensor.test_3", "group.test"}
+
+    with patch.object(
+        StateMachine, "get", autospec=True, side_effect=StateMachine.get
+    ) as states_get:
+        hass.states.async_set(
+            "group.test", "on", {ATTR_ENTITY_ID: ["sensor.test_2", "sensor.test_1"]}
+        )
+        await hass.async_block_till_done()
+        # Only the group and the added member are looked up
+        assert [x[0][1] for x in states_get.call_args_list] == [
+            "group.test",
+            "sensor.test_2",
+        ]
+    assert hass.states.get("sensor.test").state == "2"
+
+    hass.states.async_set("group.test", "on", {ATTR_ENTITY_ID: []})
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "3"
+    assert dispatcher.entity_ids == {"sensor.test_3", "group.test"}
+
+    hass.states.async_set("sensor.test_2", 22)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "3"
+
+
+async def test_sensor_group_tracking_max_age(hass, freezer):
+    """Test sources expire after their positions change."""
+    hass.states.async_set("sensor.test_1", STATE_UNAVAILABLE)
+    hass.states.async_set("sensor.test_2", 2)
+    hass.states.async_set("sensor.test_3", 3)
+    hass.states.async_set("group.test", "on", {ATTR_ENTITY_ID: []})
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["group.test", "sensor.test_2", "sensor.test_3"],
+            CONF_MAX_AGE: {"seconds": 60},
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "2"
+
+    hass.states.async_set("group.test", "on", {ATTR_ENTITY_ID: ["sensor.test_1"]})
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "2"
+
+    freezer.tick(timedelta(seconds=40))
+    hass.states.async_set("sensor.test_3", 3)
+    await hass.async_block_till_done()
+
+    freezer.tick(timedelta(seconds=30))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test")
+    assert state.state == "3"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_3"
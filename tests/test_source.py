@@ -0,0 +1,149 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""Test backup_source options of single sources."""
+
+from datetime import timedelta
+
+import pytest
+import voluptuous as vol
+from homeassistant.components.sensor import DOMAIN as DOMAIN_SENSOR
+from homeassistant.const import (
+    CONF_ENTITY_ID,
+    CONF_NAME,
+    CONF_OFFSET,
+    CONF_PLATFORM,
+    STATE_UNAVAILABLE,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import (
+    assert_setup_component,
+    async_fire_time_changed,
+)
+
+from custom_components.backup_source.binary_sensor import (
+    PLATFORM_SCHEMA as BINARY_SENSOR_PLATFORM_SCHEMA,
+)
+from custom_components.backup_source.const import (
+    ATTR_SOURCE,
+    CONF_MAX_AGE,
+    CONF_PRIORITY,
+    CONF_SCALE,
+    CONF_SKIP_NO_VALUE,
+    CONF_SOURCES,
+    CONF_STRATEGY,
+    DOMAIN,
+    STRATEGY_MEAN,
+)
+from custom_components.backup_source.sensor import (
+    PLATFORM_SCHEMA as SENSOR_PLATFORM_SCHEMA,
+)
+from custom_components.backup_source.source import SourceRecord
+from custom_components.backup_source.weather import (
+    PLATFORM_SCHEMA as WEATHER_PLATFORM_SCHEMA,
+)
+
+
+def test_record() -> None:
+    """Test transform of values by record."""
+    record = SourceRecord(tier=0)
+    assert not record.transforms
+    assert record.transform(5.0) == 5.0
+
+    record = SourceRecord(tier=0, scale=0.001, offset=-1)
+    assert record.transforms
+    assert record.transform(2500.0) == 1.5
+
+    assert SourceRecord(tier=0, offset=0).transforms
+
+
+def test_source_schema() -> None:
+    """Test values of sources can be rescaled for sensors only."""
+    config = {
+        CONF_PLATFORM: DOMAIN,
+        CONF_NAME: "test",
+        CONF_SOURCES: [
+            "sensor.test_1",
+            [{CONF_ENTITY_ID: "sensor.test_2", CONF_SCALE: 2, CONF_OFFSET: 1}],
+        ],
+    }
+    assert SENSOR_PLATFORM_SCHEMA(config)[CONF_SOURCES][1] == [
+        {CONF_ENTITY_ID: "sensor.test_2", CONF_SCALE: 2.0, CONF_OFFSET: 1.0}
+    ]
+
+    for schema in (BINARY_SENSOR_PLATFORM_SCHEMA, WEATHER_PLATFORM_SCHEMA):
+        with pytest.raises(vol.Invalid, match="extra keys not allowed"):
+            schema(config)
+
+
+async def test_source_options(hass: HomeAssistant, freezer) -> None:
+    """Test options of single sources are applied on selection."""
+    hass.states.async_set("sensor.test_1", 1)
+    hass.states.async_set("sensor.test_2", 2000)
+    hass.states.async_set("sensor.test_3", STATE_UNAVAILABLE)
+
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: [
+                "sensor.test_1",
+                {
+                    CONF_ENTITY_ID: "sensor.test_2",
+                    CONF_PRIORITY: 1,
+                    CONF_SCALE: 0.001,
+                    CONF_OFFSET: 0.5,
+                    CONF_MAX_AGE: {"minutes": 5},
+                },
+                {CONF_ENTITY_ID: "sensor.test_3", CONF_SKIP_NO_VALUE: False},
+            ],
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+
+    # Source with higher priority goes first and is rescaled
+    entity = hass.data[DOMAIN]["entities"]["sensor.test"]
+    assert entity.sources == ["sensor.test_2", "sensor.test_1", "sensor.test_3"]
+    assert [record.tier for record in entity._records] == [0, 1, 2]
+    state = hass.states.get("sensor.test")
+    # Precision grows by the scale down of the source
+    assert state.state == "2.500"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_2"
+
+    # Only the source with max_age expires
+    freezer.tick(timedelta(minutes=6))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test")
+    assert state.state == "1"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_1"
+
+    # Source without skip_no_value is selected with no value
+    hass.states.async_set("sensor.test_1", STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test")
+    assert state.state == STATE_UNAVAILABLE
+    assert entity._selected == 2
+
+
+async def test_source_transform_aggregated(hass: HomeAssistant) -> None:
+    """Test rescaled values of sources are aggregated."""
+    hass.states.async_set("sensor.test_1", 10)
+    hass.states.async_set("sensor.test_2", 1)
+
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: [
+                "sensor.test_1",
+                {CONF_ENTITY_ID: "sensor.test_2", CONF_SCALE: 30},
+            ],
+            CONF_STRATEGY: STRATEGY_MEAN,
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "20"
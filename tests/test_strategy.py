@@ -0,0 +1,68 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""Test backup_source selection strategies."""
+
+import pytest
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import State
+
+from custom_components.backup_source.strategy import SourceValues, as_float
+
+
+@pytest.mark.parametrize(
+    ("state", "expected"),
+    [
+        (None, None),
+        (State("sensor.test", "1.5"), 1.5),
+        (State("sensor.test", "abc"), None),
+        (State("sensor.test", STATE_UNAVAILABLE), None),
+        (State("sensor.test", "nan"), None),
+        (State("sensor.test", "inf"), None),
+    ],
+)
+def test_as_float(state, expected):
+    """Test as_float function."""
+    assert as_float(state) == expected
+
+
+def test_update():
+    """Test SourceValues.update method."""
+    values = SourceValues()
+    values.reset([3.0, None, 1.0])
+    assert len(values) == 2
+    assert values.median() == 2.0
+
+    assert not values.update(0, 3.0)
+    assert values.update(1, 2.0)
+    assert len(values) == 3
+    assert values.median() == 2.0
+
+    assert values.update(0, None)
+    assert values.update(2, 10.0)
+    assert values.median() == 6.0
+
+    values.reset([])
+    assert len(values) == 0
+    assert values.median() is None
+    assert values.mean() is None
+
+
+def test_mean():
+    """Test SourceValues.mean method."""
+    values = SourceValues()
+    values.reset([20.0, 21.0, 22.0, 100.0])
+    assert values.mean() == 40.75
+    assert values.mean(tolerance=5) == 21.0
+    assert values.mean(tolerance=0) is None
+
+
+def test_quorum():
+    """Test SourceValues.quorum method."""
+    values = SourceValues()
+    values.reset([20.0, 20.0, 30.0])
+    assert values.quorum(2) == 20.0
+    assert values.quorum(3) is None
+    assert values.quorum(3, tolerance=10) == 20.0
+
+    values.update(1, 25.0)
+    assert values.quorum(2) is None
+    assert values.quorum(2, tolerance=5) == 25.0
@@ -0,0 +1,86 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""Test backup_source shared timer queue."""
+
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.backup_source.const import DATA_TIMER_QUEUE, DOMAIN
+from custom_components.backup_source.timer import TimerQueue, async_get_timer_queue
+
+
+async def test_async_get_timer_queue(hass):
+    """Test async_get_timer_queue function."""
+    queue = async_get_timer_queue(hass)
+
+    assert isinstance(queue, TimerQueue)
+    assert hass.data[DOMAIN][DATA_TIMER_QUEUE] is queue
+    assert async_get_timer_queue(hass) is queue
+
+
+async def test_schedule(hass, freezer):
+    """Test actions are called in order of their deadlines."""
+    queue = async_get_timer_queue(hass)
+    calls = []
+    now = dt_util.utcnow().timestamp()
+
+    entry_1 = queue.async_schedule(now + 20, lambda: calls.append(1))
+    queue.async_schedule(now + 10, lambda: calls.append(2))
+    entry_3 = queue.async_schedule(now + 15, lambda: calls.append(3))
+    assert len(queue) == 3
+
+    queue.async_cancel(entry_3)
+    queue.async_cancel(entry_3)
+    assert not entry_3.active
+    assert len(queue) == 2
+
+    freezer.tick(timedelta(seconds=11))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert calls == [2]
+    assert entry_1.active
+
+    freezer.tick(timedelta(seconds=10))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert calls == [2, 1]
+    assert not entry_1.active
+    assert len(queue) == 0
+
+
+async def test_compact(hass):
+    """Test cancelled entries are dropped from queue."""
+    queue = async_get_timer_queue(hass)
+    now = dt_util.utcnow().timestamp()
+
+    entries = [queue.async_schedule(now + 10 + i, MagicMock()) for i in range(200)]
+    for entry in entries[:150]:
+        queue.async_cancel(entry)
+
+    assert len(queue) == 50
+    assert len(queue._heap) < 200
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+    assert len(queue) == 0
+    assert not entries[-1].active
+
+
+async def test_action_error(hass, freezer, caplog):
+    """Test errors in actions do not break the queue."""
+    queue = async_get_timer_queue(hass)
+    action = MagicMock()
+    now = dt_util.utcnow().timestamp()
+
+    queue.async_schedule(now + 1, MagicMock(side_effect=ValueError))
+    queue.async_schedule(now + 1, action)
+
+    freezer.tick(timedelta(seconds=2))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert action.called
+    assert "Error while calling timer action" in caplog.text
@@ -0,0 +1,56 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""Test backup_source unit normalization."""
+
+import pytest
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import UnitOfPressure, UnitOfTemperature
+
+from custom_components.backup_source.units import (
+    decimals,
+    resolve_converter,
+    scaled_precision,
+)
+
+
+@pytest.mark.parametrize(
+    ("from_unit", "to_unit", "device_class", "value", "expected"),
+    [
+        (UnitOfTemperature.CELSIUS, UnitOfTemperature.CELSIUS, None, 20, 20),
+        (UnitOfTemperature.FAHRENHEIT, UnitOfTemperature.CELSIUS, None, 212, 100),
+        (
+            UnitOfPressure.PA,
+            UnitOfPressure.HPA,
+            SensorDeviceClass.PRESSURE,
+            100000,
+            1000,
+        ),
+    ],
+)
+def test_resolve_converter(from_unit, to_unit, device_class, value, expected):
+    """Test resolve_converter function."""
+    converter = resolve_converter(from_unit, to_unit, device_class)
+    assert converter(value) == pytest.approx(expected)
+
+
+def test_resolve_converter_incompatible():
+    """Test resolve_converter function with incompatible units."""
+    assert resolve_converter(UnitOfPressure.PA, UnitOfTemperature.CELSIUS) is None
+    assert resolve_converter(None, UnitOfTemperature.CELSIUS) is None
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("20", 0), ("20.50", 2), ("-0.001", 3), ("1e3", 0), ("nan", None), ("on", None)],
+)
+def test_decimals(value, expected):
+    """Test decimals function."""
+    assert decimals(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("precision", "scale", "expected"),
+    [(1, 1.0, 1), (1, 1.8, 1), (1, 5 / 9, 1), (0, 0.001, 3), (2, 0.01, 4), (1, 0, 1)],
+)
+def test_scaled_precision(precision, scale, expected):
+    """Test scaled_precision function."""
+    assert scaled_precision(precision, scale) == expected
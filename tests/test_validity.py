@@ -0,0 +1,149 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""Test backup_source validity rules of source states."""
+
+from unittest.mock import patch
+
+import pytest
+import voluptuous as vol
+from homeassistant.components.sensor import DOMAIN as DOMAIN_SENSOR
+from homeassistant.const import (
+    CONF_ATTRIBUTE,
+    CONF_ENTITY_ID,
+    CONF_EXCLUDE,
+    CONF_NAME,
+    CONF_PLATFORM,
+    CONF_VALUE_TEMPLATE,
+)
+from homeassistant.core import HomeAssistant, State
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import assert_setup_component
+
+from custom_components.backup_source.const import (
+    ATTR_SOURCE,
+    CONF_MAX,
+    CONF_MIN,
+    CONF_NUMERIC,
+    CONF_SOURCES,
+    CONF_VALID_IF,
+    DOMAIN,
+    VALID_IF_SCHEMA,
+)
+from custom_components.backup_source.validity import Validity
+
+
+def _validity(hass: HomeAssistant, rules: object) -> Validity:
+    """Return validity compiled from raw rules."""
+    return Validity(hass, VALID_IF_SCHEMA(rules))
+
+
+async def test_rules(hass: HomeAssistant) -> None:
+    """Test states are checked against all rules."""
+    validity = _validity(
+        hass,
+        [
+            {CONF_MIN: 0, CONF_MAX: 60, CONF_EXCLUDE: [0]},
+            {CONF_ATTRIBUTE: "battery", CONF_MIN: 10},
+        ],
+    )
+    assert validity(State("sensor.test", "20", {"battery": 50}))
+    assert not validity(State("sensor.test", "20", {"battery": 5}))
+    assert not validity(State("sensor.test", "20"))
+    assert not validity(State("sensor.test", "61", {"battery": 50}))
+    assert not validity(State("sensor.test", "0", {"battery": 50}))
+    assert not validity(State("sensor.test", "0.0", {"battery": 50}))
+    assert not validity(State("sensor.test", "nan", {"battery": 50}))
+
+    validity = _validity(hass, {CONF_NUMERIC: True})
+    assert validity(State("sensor.test", "-1.5"))
+    assert not validity(State("sensor.test", "on"))
+
+    validity = _validity(hass, {CONF_EXCLUDE: ["-", "error", "0"]})
+    assert validity(State("sensor.test", "on"))
+    assert not validity(State("sensor.test", "error"))
+    assert not validity(State("sensor.test", "0.00"))
+    assert validity(State("sensor.test", "0.01"))
+
+
+async def test_template(hass: HomeAssistant) -> None:
+    """Test template rules are rendered once per state of source."""
+    validity = _validity(
+        hass,
+        {
+            CONF_ATTRIBUTE: "quality",
+            CONF_VALUE_TEMPLATE: "{{ value == 'good' and state.state != '-' }}",
+        },
+    )
+    state = State("sensor.test", "1", {"quality": "good"})
+    with patch(
+        "custom_components.backup_source.validity.result_as_boolean",
+        wraps=lambda value: value == "True",
+    ) as render:
+        assert validity(state)
+        assert validity(state)
+        assert render.call_count == 1
+
+        assert not validity(State("sensor.test", "-", {"quality": "good"}))
+        assert not validity(State("sensor.test", "1", {"quality": "bad"}))
+        assert render.call_count == 3
+
+    # Templates may read the state of the source only
+    with pytest.raises(vol.Invalid, match="got: is_state, states"):
+        VALID_IF_SCHEMA(
+            {
+                CONF_VALUE_TEMPLATE: (
+                    "{{ states('sensor.battery') | int > 10"
+                    " and not is_state('sensor.test', 'off') }}"
+                )
+            }
+        )
+    assert VALID_IF_SCHEMA(
+        {CONF_VALUE_TEMPLATE: "{% for x in range(3) %}{{ value }}{% endfor %}"}
+    )
+
+    # Errors of rendering make state invalid
+    validity = _validity(hass, {CONF_VALUE_TEMPLATE: "{{ value | float > 0 }}"})
+    assert validity(State("sensor.test", "1"))
+    assert not validity(State("sensor.test", "on"))
+
+
+async def test_valid_if(hass: HomeAssistant) -> None:
+    """Test sources with invalid values are skipped."""
+    hass.states.async_set("sensor.test_1", 85)
+    hass.states.async_set("sensor.test_2", 0)
+    hass.states.async_set("sensor.test_3", 20)
+
+    config = {
+        DOMAIN_SENSOR: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: [
+                "sensor.test_1",
+                {
+                    CONF_ENTITY_ID: "sensor.test_2",
+                    CONF_VALID_IF: {CONF_EXCLUDE: ["0"]},
+                },
+                "sensor.test_3",
+            ],
+            CONF_VALID_IF: {CONF_MIN: -30, CONF_MAX: 60},
+        },
+    }
+    with assert_setup_component(1, DOMAIN_SENSOR):
+        assert await async_setup_component(hass, DOMAIN_SENSOR, config)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test")
+    assert state.state == "20"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_3"
+
+    # Rules of a source replace ones of the entity
+    hass.states.async_set("sensor.test_2", 99)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test")
+    assert state.state == "99"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_2"
+
+    hass.states.async_set("sensor.test_1", 25)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test")
+    assert state.state == "25"
+    assert state.attributes[ATTR_SOURCE] == "sensor.test_1"
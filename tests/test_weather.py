@@ -1,20 +1,26 @@
 # pylint: disable=protected-access,redefined-outer-name
 """Test backup_source setup process."""
 
-from unittest.mock import MagicMock
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
 
 import pytest
 from homeassistant.components.template import DOMAIN as DOMAIN_TEMPLATE
 from homeassistant.components.template.weather import (
     CONF_CONDITION_TEMPLATE,
+    CONF_FORECAST_DAILY_TEMPLATE,
     CONF_HUMIDITY_TEMPLATE,
     CONF_TEMPERATURE_TEMPLATE,
 )
 from homeassistant.components.weather import DOMAIN as DOMAIN_WEATHER
+from homeassistant.components.weather import SERVICE_GET_FORECASTS
 from homeassistant.const import (
+    ATTR_ENTITY_ID,
     CONF_NAME,
     CONF_PLATFORM,
     CONF_UNIQUE_ID,
+    EVENT_CALL_SERVICE,
+    STATE_UNAVAILABLE,
     UnitOfLength,
     UnitOfPressure,
     UnitOfSpeed,
@@ -22,9 +28,14 @@ from homeassistant.const import (
 )
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import async_setup_component
-from pytest_homeassistant_custom_component.common import assert_setup_component
+from pytest_homeassistant_custom_component.common import (
+    assert_setup_component,
+    async_capture_events,
+    async_fire_time_changed,
+)
 
 from custom_components.backup_source import CONF_SKIP_NO_VALUE, CONF_SOURCES, DOMAIN
+from custom_components.backup_source.const import CONF_FORECAST_TTL, CONF_MERGE
 from custom_components.backup_source.weather import (
     BackupSourceWeather,
     async_setup_platform,
@@ -89,3 +100,121 @@ async def test_weather(hass, caplog, test_entities, config):
     assert entity.native_visibility is None
     assert entity.native_visibility_unit == UnitOfLength.KILOMETERS
     assert entity.native_precipitation_unit == UnitOfLength.MILLIMETERS
+
+
+async def _async_get_forecast(hass, entity_id: str) -> list[dict]:
+    """Return daily forecast of weather entity."""
+    response = await hass.services.async_call(
+        DOMAIN_WEATHER,
+        SERVICE_GET_FORECASTS,
+        {ATTR_ENTITY_ID: entity_id, "type": "daily"},
+        blocking=True,
+        return_response=True,
+    )
+    return response[entity_id]["forecast"]
+
+
+async def test_weather_forecast(hass, freezer):
+    """Test forecasts of sources are passed through and cached."""
+    config = {
+        DOMAIN_WEATHER: [
+            {
+                CONF_PLATFORM: DOMAIN_TEMPLATE,
+                CONF_NAME: f"test_{index}",
+                CONF_CONDITION_TEMPLATE: "{{ 'sunny' }}",
+                CONF_TEMPERATURE_TEMPLATE: "{{ 20 }}",
+                CONF_HUMIDITY_TEMPLATE: "{{ 34 }}",
+                CONF_FORECAST_DAILY_TEMPLATE: (
+                    "{{ [{'datetime': '2024-06-01T00:00:00+00:00',"
+                    f" 'condition': 'sunny', 'temperature': {index}}}] }}}}"
+                ),
+            }
+            for index in (1, 2)
+        ]
+        + [
+            {
+                CONF_PLATFORM: DOMAIN,
+                CONF_NAME: "test",
+                CONF_SOURCES: ["weather.test_1", "weather.test_2"],
+                CONF_FORECAST_TTL: {"minutes": 5},
+            },
+        ],
+    }
+    with assert_setup_component(3, DOMAIN_WEATHER):
+        assert await async_setup_component(hass, DOMAIN_WEATHER, config)
+    await hass.async_block_till_done()
+
+    calls = async_capture_events(hass, EVENT_CALL_SERVICE)
+    forecast = await _async_get_forecast(hass, "weather.test")
+    assert forecast[0]["temperature"] == 1.0
+    assert len(calls) == 2
+
+    # Cached forecast is returned without calling the source
+    await _async_get_forecast(hass, "weather.test")
+    assert len(calls) == 3
+
+    freezer.tick(timedelta(minutes=6))
+    async_fire_time_changed(hass)
+    await _async_get_forecast(hass, "weather.test")
+    assert len(calls) == 5
+
+    # Expired forecast is refreshed once, even if nobody listens to it
+    entity = hass.data[DOMAIN]["entities"]["weather.test"]
+    entity._async_publish()
+    await _async_get_forecast(hass, "weather.test")
+    freezer.tick(timedelta(minutes=6))
+    async_fire_time_changed(hass)
+    with patch.object(entity, "async_update_listeners") as update_listeners:
+        entity._async_publish()
+        entity._async_publish()
+        await hass.async_block_till_done()
+    assert update_listeners.call_count == 1
+    assert update_listeners.call_args[0][0] == ["daily"]
+
+    # Cache is invalidated on source switch
+    hass.states.async_set("weather.test_1", STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+    forecast = await _async_get_forecast(hass, "weather.test")
+    assert forecast[0]["temperature"] == 2.0
+    assert calls[-1].data["service_data"][ATTR_ENTITY_ID] == "weather.test_2"
+
+
+async def test_weather_merge(hass):
+    """Test missing fields are filled from lower priority sources."""
+    hass.states.async_set("weather.test_1", "sunny", {"temperature": 20})
+    hass.states.async_set(
+        "weather.test_2", "rainy", {"temperature": 18, "humidity": 80, "ozone": 5}
+    )
+    config = {
+        DOMAIN_WEATHER: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "test",
+            CONF_SOURCES: ["weather.test_1", "weather.test_2"],
+            CONF_MERGE: True,
+        },
+    }
+    with assert_setup_component(1, DOMAIN_WEATHER):
+        assert await async_setup_component(hass, DOMAIN_WEATHER, config)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("weather.test")
+    assert state.state == "sunny"
+    assert state.attributes["temperature"] == 20
+    assert state.attributes["humidity"] == 80
+    assert state.attributes["ozone"] == 5
+
+    hass.states.async_set(
+        "weather.test_2", "rainy", {"temperature": 18, "humidity": 70, "ozone": 5}
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get("weather.test").attributes["humidity"] == 70
+
+    hass.states.async_set(
+        "weather.test_1", "cloudy", {"temperature": 21, "humidity": 60}
+    )
+    await hass.async_block_till_done()
+    state = hass.states.get("weather.test")
+    assert state.state == "cloudy"
+    assert state.attributes["temperature"] == 21
+    assert state.attributes["humidity"] == 60
+    assert state.attributes["ozone"] == 5